@@ -8,20 +8,175 @@ classes. Each function here can be called from Jac code via the 'can' ability sy
 Author: The Intelligent Crew
 """
 
-import os
+import asyncio
+import logging
+import subprocess
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
-import json
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Tuple
+
+import orjson
+
+# zstandard is optional; without it the CCG cache stays in memory only
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 # Import existing utilities
+from utils.disk_cache import atomic_write_bytes, prune_cache, touch
 from utils.file_utils import FileUtils
 from utils.parser import CodeParser
-from utils.gemini_client import GeminiClient
 
-# Initialize utilities as singletons
-file_utils = FileUtils()
-parser = CodeParser()
-gemini = GeminiClient()
+# The Gemini SDK is heavy to import; it's loaded on the first AI ability call
+if TYPE_CHECKING:
+    from utils.gemini_client import GeminiClient
+
+# Cache diagnostics go through logging, like the orchestrator's progress,
+# so concurrent analyses don't interleave raw stdout
+logger = logging.getLogger(__name__)
+
+# Utilities are lazy singletons, constructed on first use rather than at
+# import so entrypoints that never call an ability skip the setup cost
+@lru_cache(maxsize=1)
+def _file_utils() -> FileUtils:
+    return FileUtils()
+
+
+@lru_cache(maxsize=1)
+def _parser() -> CodeParser:
+    return CodeParser()
+
+
+def _gemini() -> "GeminiClient":
+    from utils.gemini_client import get_gemini_client
+    return get_gemini_client()
+
+
+# Analysis memo caches keyed by (repo_path, HEAD commit sha), so re-analysing
+# an unchanged checkout skips the tree walk and the full parse
+_MEMO_MAX_ENTRIES = 32
+_memo_lock = threading.Lock()
+_FILE_TREE_CACHE: "OrderedDict[Tuple[str, str, str], Tuple[Dict[str, Any], List[str]]]" = OrderedDict()
+_CCG_CACHE: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+
+# On-disk copy of the CCG cache, shared across workers and restarts. Lives
+# outside outputs/<repo>/ since that directory is wiped on every clone.
+# Bump the version whenever the parser's output format changes.
+_CCG_DISK_CACHE_DIR = Path("outputs") / ".ccg_cache"
+_CCG_DISK_CACHE_VERSION = 3
+_CCG_DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Per-file parse results keyed by content hash. Unlike the CCG cache this
+# survives commits, so re-analysing a repo only re-parses files that changed.
+_AST_CACHE_DIR = Path("outputs") / ".ast_cache"
+_AST_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Default sha argument: look HEAD up in the memoized helpers themselves.
+# Callers that already ran head_sha pass its result (None included) instead.
+_RESOLVE_SHA: Any = object()
+
+
+def head_sha(repo_path: str) -> Optional[str]:
+    """
+    Identify the commit a checkout is at, for keying analysis caches.
+    
+    Runs git rev-parse and git status once; callers analysing the same
+    checkout several times should resolve it once and pass it along.
+    
+    Args:
+        repo_path (str): Path to the cloned repository
+    
+    Returns:
+        Optional[str]: HEAD sha of a clean checkout, or None if it can't be
+                       trusted (not a git repo, or locally modified)
+    
+    Called by: Python orchestrator
+    """
+    try:
+        sha = subprocess.check_output(
+            ['git', '-C', repo_path, 'rev-parse', 'HEAD'],
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+        dirty = subprocess.check_output(
+            ['git', '-C', repo_path, 'status', '--porcelain'],
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    
+    # Local modifications mean HEAD no longer describes the working tree
+    return None if dirty else sha
+
+
+def _ccg_disk_path(sha: str, variant: str) -> Path:
+    return _CCG_DISK_CACHE_DIR / f".ccg-v{_CCG_DISK_CACHE_VERSION}-{variant}-{sha}.json.zst"
+
+
+def _load_persisted_ccg(sha: str, variant: str) -> Optional[Dict[str, Any]]:
+    """Read a zstd-compressed CCG for this commit, if one was saved"""
+    path = _ccg_disk_path(sha, variant)
+    if not ZSTD_AVAILABLE or not path.exists():
+        return None
+    try:
+        code_graph = orjson.loads(zstandard.ZstdDecompressor().decompress(path.read_bytes()))
+    except (OSError, zstandard.ZstdError, orjson.JSONDecodeError) as e:
+        logger.warning("Ignoring unreadable CCG cache %s: %s", path, e)
+        return None
+    touch(path)
+    logger.info("Reusing cached code graph %s", path.name)
+    return code_graph
+
+
+def _persist_ccg(sha: str, variant: str, code_graph: Dict[str, Any]):
+    """Save a CCG for this commit as zstd-compressed JSON"""
+    if not ZSTD_AVAILABLE:
+        return
+    path = _ccg_disk_path(sha, variant)
+    try:
+        blob = zstandard.ZstdCompressor(level=3).compress(orjson.dumps(code_graph))
+        # Write then rename so concurrent readers never see a partial file
+        atomic_write_bytes(path, blob)
+    except OSError as e:
+        logger.warning("Could not persist CCG cache %s: %s", path, e)
+        return
+    prune_cache(_CCG_DISK_CACHE_DIR, _CCG_DISK_CACHE_MAX_BYTES)
+
+
+def _memoized(cache: OrderedDict, repo_path: str,
+              build: Callable[[str], Any],
+              persist: bool = False, variant: str = "default",
+              sha: Optional[str] = _RESOLVE_SHA) -> Any:
+    """
+    Look up or compute a per-commit analysis result in an LRU cache,
+    optionally backed by the on-disk CCG cache. variant separates results
+    built from different inputs for the same commit.
+    """
+    if sha is _RESOLVE_SHA:
+        sha = head_sha(repo_path)
+    if sha is None:
+        return build(repo_path)
+    
+    key = (repo_path, sha, variant)
+    with _memo_lock:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+    
+    result = _load_persisted_ccg(sha, variant) if persist else None
+    if result is None:
+        result = build(repo_path)
+        if persist:
+            _persist_ccg(sha, variant, result)
+    
+    with _memo_lock:
+        cache[key] = result
+        if len(cache) > _MEMO_MAX_ENTRIES:
+            cache.popitem(last=False)
+    return result
 
 
 def git_clone_repo(github_url: str) -> Optional[str]:
@@ -40,7 +195,7 @@ def git_clone_repo(github_url: str) -> Optional[str]:
     
     Called by: Navigator agent
     """
-    return file_utils.clone_repository(github_url)
+    return _file_utils().clone_repository(github_url)
 
 
 def build_file_tree(repo_path: str) -> Dict[str, Any]:
@@ -60,7 +215,25 @@ def build_file_tree(repo_path: str) -> Dict[str, Any]:
     
     Called by: Navigator agent
     """
-    return file_utils.build_file_tree(repo_path)
+    return scan_repository(repo_path)[0]
+
+
+def scan_repository(repo_path: str,
+                    sha: Optional[str] = _RESOLVE_SHA) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Build the file tree and list candidate source files in a single walk.
+    
+    Args:
+        repo_path (str): Path to the cloned repository
+        sha (Optional[str]): head_sha(repo_path), looked up if omitted
+    
+    Returns:
+        Tuple[Dict[str, Any], List[str]]: The build_file_tree structure and
+                                          source file paths for the CCG
+    
+    Called by: Python orchestrator
+    """
+    return _memoized(_FILE_TREE_CACHE, repo_path, _file_utils().scan_repository, sha=sha)
 
 
 def summarize_readme(repo_path: str) -> str:
@@ -78,8 +251,26 @@ def summarize_readme(repo_path: str) -> str:
     
     Called by: Navigator agent
     """
-    readme_content = file_utils.get_readme(repo_path)
-    return gemini.summarize_readme(readme_content)
+    readme_content = _file_utils().get_readme(repo_path)
+    return _gemini().summarize_readme(readme_content)
+
+
+async def summarize_readme_async(repo_path: str) -> str:
+    """
+    Async counterpart of summarize_readme.
+    
+    Lets the Gemini round-trip run concurrently with other analysis stages.
+    
+    Args:
+        repo_path (str): Path to the cloned repository
+    
+    Returns:
+        str: AI-generated summary of the README content
+    
+    Called by: Python workflow orchestrator
+    """
+    readme_content = await asyncio.to_thread(_file_utils().get_readme, repo_path)
+    return await _gemini().summarize_readme_async(readme_content)
 
 
 def parse_code_structure(repo_path: str) -> Dict[str, Any]:
@@ -97,10 +288,11 @@ def parse_code_structure(repo_path: str) -> Dict[str, Any]:
     
     Called by: Inspector agent
     """
-    return parser.build_code_context_graph(repo_path)
+    return build_code_context_graph(repo_path)
 
 
-def build_code_context_graph(repo_path: str) -> Dict[str, Any]:
+def build_code_context_graph(repo_path: str, files: Optional[List[str]] = None,
+                             sha: Optional[str] = _RESOLVE_SHA) -> Dict[str, Any]:
     """
     Build the Code Context Graph (CCG) from repository files.
     
@@ -110,6 +302,9 @@ def build_code_context_graph(repo_path: str) -> Dict[str, Any]:
     
     Args:
         repo_path (str): Path to the cloned repository
+        files (Optional[List[str]]): Source files from scan_repository; the
+                                     repository is walked again if omitted
+        sha (Optional[str]): head_sha(repo_path), looked up if omitted
     
     Returns:
         Dict[str, Any]: Code Context Graph with nodes (functions, classes),
@@ -117,7 +312,17 @@ def build_code_context_graph(repo_path: str) -> Dict[str, Any]:
     
     Called by: Inspector agent
     """
-    return parser.build_code_context_graph(repo_path)
+    def build(path: str) -> Dict[str, Any]:
+        code_graph = _parser().build_code_context_graph(path, files, cache_dir=_AST_CACHE_DIR)
+        prune_cache(_AST_CACHE_DIR, _AST_CACHE_MAX_BYTES)
+        return code_graph
+    
+    return _memoized(
+        _CCG_CACHE, repo_path, build,
+        # The parser's own walk and a scan_repository list can select
+        # different files, so their graphs are cached apart
+        persist=True, variant="walk" if files is None else "scan", sha=sha
+    )
 
 
 def generate_markdown_docs(context: Dict[str, Any]) -> str:
@@ -140,7 +345,23 @@ def generate_markdown_docs(context: Dict[str, Any]) -> str:
     Called by: Author agent
     """
     context['repo_url'] = context.get('repo_url', '')
-    return gemini.generate_documentation(context)
+    return _gemini().generate_documentation(context)
+
+
+async def generate_markdown_docs_async(context: Dict[str, Any]) -> str:
+    """
+    Async counterpart of generate_markdown_docs.
+    
+    Args:
+        context (Dict[str, Any]): Same analysis context as generate_markdown_docs
+    
+    Returns:
+        str: Complete Markdown documentation
+    
+    Called by: Python workflow orchestrator
+    """
+    context['repo_url'] = context.get('repo_url', '')
+    return await _gemini().generate_documentation_async(context)
 
 
 def generate_mermaid_diagram(code_graph: Dict[str, Any]) -> str:
@@ -160,7 +381,7 @@ def generate_mermaid_diagram(code_graph: Dict[str, Any]) -> str:
     Called by: Designer agent
     """
     file_tree = code_graph.get('file_tree', {})
-    return gemini.generate_diagram(code_graph, file_tree)
+    return _gemini().generate_diagram(code_graph, file_tree)
 
 
 def embed_diagram_in_docs(documentation: str, mermaid_diagram: str) -> str:
@@ -216,6 +437,6 @@ def save_documentation(documentation: str, repo_name: str) -> str:
     
     Called by: Designer agent
     """
-    return file_utils.save_documentation(documentation, repo_name)
+    return _file_utils().save_documentation(documentation, repo_name)
 
 
@@ -114,8 +114,10 @@ function App() {
         // Fetch the documentation content
         if (response.data.result?.output_path) {
           try {
-            const docResponse = await axios.get(`/api/documentation/${response.data.result.repo_name}`)
-            setDocumentation(docResponse.data.content)
+            const docResponse = await axios.get(`/api/documentation/${response.data.result.repo_name}`, {
+              responseType: 'text'
+            })
+            setDocumentation(docResponse.data)
           } catch (err) {
             console.error('Error fetching documentation:', err)
           }
@@ -3,30 +3,47 @@ Jac Orchestrator
 Executes Jac walkers and integrates with Python backend
 """
 
+import asyncio
+import hashlib
+import logging
 import os
-import sys
-from typing import Dict, Any, Optional
+import threading
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
-# Try to import jaclang for Jaseci 2.0.0
-try:
-    from jaclang import JacMachine
-    from jaclang.runtimelib.machine import JacMachineImpl
-    JAC_AVAILABLE = True
-    print("✓ Jaseci 2.0.0 (jaclang) available - using Jac runtime")
-except ImportError:
-    JAC_AVAILABLE = False
-    print("Warning: Jaseci not available, falling back to Python implementation")
-
-from abilities import (
-    git_clone_repo, build_file_tree, summarize_readme,
-    parse_code_structure, build_code_context_graph,
-    generate_markdown_docs, generate_mermaid_diagram,
-    embed_diagram_in_docs, extract_repo_name, save_documentation
-)
+import orjson
+
+from abilities import scan_repository, build_code_context_graph, head_sha
+from utils.disk_cache import atomic_write_bytes, prune_cache, touch
 from utils.file_utils import FileUtils
-from utils.parser import CodeParser
-from utils.gemini_client import GeminiClient
+
+if TYPE_CHECKING:
+    from utils.gemini_client import GeminiClient
+
+# Workflow progress goes through logging so concurrent analyses don't
+# interleave raw stdout; it stays quiet unless the caller configures handlers
+logger = logging.getLogger(__name__)
+
+# Finished analyses keyed by (repo URL, HEAD commit sha). Lives next to the
+# CCG cache, outside outputs/<repo>/ which is wiped on every clone. Bump the
+# version whenever the result format changes.
+_RESULT_CACHE_DIR = Path("outputs") / ".result_cache"
+_RESULT_CACHE_VERSION = 1
+_RESULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+@lru_cache(maxsize=1)
+def jac_available() -> bool:
+    """Check (once, on first use) whether jaclang for Jaseci 2.0.0 is installed"""
+    try:
+        from jaclang import JacMachine
+        from jaclang.runtimelib.machine import JacMachineImpl
+    except ImportError:
+        logger.warning("Jaseci not available, falling back to Python implementation")
+        return False
+    logger.info("✓ Jaseci 2.0.0 (jaclang) available - using Jac runtime")
+    return True
 
 
 class JacOrchestrator:
@@ -34,12 +51,28 @@ class JacOrchestrator:
     
     def __init__(self):
         self.file_utils = FileUtils()
-        self.parser = CodeParser()
-        self.gemini = GeminiClient()
         self.abilities_registered = False
         
+        # Long-lived event loop for the async workflow steps. The Gemini SDK
+        # caches its async channel on the first loop it runs on, so reusing
+        # one loop keeps that connection alive across analyses.
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(
+            target=self._loop.run_forever, name="orchestrator-loop", daemon=True
+        ).start()
+        
+    # The Gemini client (which pulls in the Gemini SDK) is built on first
+    # use, keeping orchestrator creation and module import cheap
+    
+    @cached_property
+    def gemini(self) -> "GeminiClient":
+        from utils.gemini_client import get_gemini_client
+        return get_gemini_client()
+    
     def register_abilities(self):
         """Register abilities with Jaseci (placeholder for future implementation)"""
+        if not jac_available():
+            return False
         # TODO: Implement for Jaseci 2.0.0 when API is clarified  
         return False
     
@@ -51,62 +84,146 @@ class JacOrchestrator:
         # For now, always use Python implementation
         # Jaseci 2.0.0 has significantly different API and syntax
         # TODO: Update to use new JacMachine API when syntax is clarified
-        print("🐍 Using Python implementation (Jaseci 2.0.0 API integration pending)")
+        logger.info("🐍 Using Python implementation (Jaseci 2.0.0 API integration pending)")
         return self._execute_python_workflow(github_url)
     
-    def _execute_python_workflow(self, github_url: str) -> Dict[str, Any]:
+    async def _analyze_async(self, github_url: str, repo_path: str, output_path: Path,
+                             sha: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any], str, str, List[str]]:
         """
-        Python implementation of the workflow
-        This is what currently works
+        Run the independent analysis stages concurrently: the file tree walk
+        and code graph build (local I/O and parsing) overlap the README
+        summary (a Gemini round-trip), and the diagram is drawn while the
+        documentation streams to docs.md. Returns the file tree, graph,
+        diagram, doc path, and the Gemini steps that fell back to canned text.
         """
-        print("🧭 Captain: All hands on deck! Initiating code exploration mission... ⚓")
-        
-        # Step 1: Clone repository
-        print("🗺️ Navigator: Charting course to digital treasure... 🏴‍☠️")
-        repo_path = self.file_utils.clone_repository(github_url)
-        if not repo_path:
-            raise Exception("💥 Houston, we have a problem! Repository clone failed")
-        
+        fallbacks: List[str] = []
+
         # Step 2: Build file tree
-        print("🗺️ Navigator: Mapping the digital landscape... 🗾")
-        file_tree = self.file_utils.build_file_tree(repo_path)
+        logger.info("🗺️ Navigator: Mapping the digital landscape... 🗾")
         
         # Step 3: Summarize README
-        print("🗺️ Navigator: Deciphering ancient README scrolls... 📜")
+        logger.info("🗺️ Navigator: Deciphering ancient README scrolls... 📜")
         readme_content = self.file_utils.get_readme(repo_path)
-        readme_summary = self.gemini.summarize_readme(readme_content)
         
         # Step 4: Build code graph
-        print("🔍 Inspector: CSI: Code Scene Investigation in progress... 🕵️‍♂️")
-        code_graph = self.parser.build_code_context_graph(repo_path)
+        logger.info("🔍 Inspector: CSI: Code Scene Investigation in progress... 🕵️‍♂️")
+        (file_tree, code_graph), readme_summary = await asyncio.gather(
+            asyncio.to_thread(self._scan_and_build_graph, repo_path, sha),
+            self.gemini.summarize_readme_async(readme_content, fallbacks)
+        )
         
         # Step 5: Generate documentation
-        print("✍️ Author: Weaving tales of code and glory... 📚✨")
+        logger.info("✍️ Author: Weaving tales of code and glory... 📚✨")
         context = {
             'code_graph': code_graph,
             'file_tree': file_tree,
             'readme_summary': readme_summary,
             'repo_url': github_url
         }
-        documentation = self.gemini.generate_documentation(context)
         
         # Step 6: Generate diagram
-        print("🎨 Designer: Painting digital masterpieces... 🎭")
-        diagram = self.gemini.generate_diagram(code_graph, file_tree)
+        logger.info("🎨 Designer: Painting digital masterpieces... 🎭")
+        doc_path, diagram = await asyncio.gather(
+            self.file_utils.write_documentation_stream(
+                output_path, self.gemini.stream_documentation_async(context, fallbacks)
+            ),
+            asyncio.to_thread(self.gemini.generate_diagram, code_graph, file_tree)
+        )
+        
+        return file_tree, code_graph, diagram, doc_path, fallbacks
+    
+    def _scan_and_build_graph(self, repo_path: str,
+                              sha: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Walk the repo once for the file tree, then parse the files it found"""
+        file_tree, source_files = scan_repository(repo_path, sha=sha)
+        return file_tree, build_code_context_graph(repo_path, files=source_files, sha=sha)
+    
+    def _result_cache_path(self, github_url: str, sha: Optional[str]) -> Optional[Path]:
+        """Locate the cached analysis for this URL at the cloned HEAD commit"""
+        if sha is None:
+            return None
+        key = hashlib.sha1(f"{github_url}|{sha}".encode()).hexdigest()
+        return _RESULT_CACHE_DIR / f"result-v{_RESULT_CACHE_VERSION}-{key}.json"
+    
+    def _load_cached_result(self, cache_path: Path) -> Optional[Dict[str, Any]]:
+        """Read a cached analysis, if one was saved"""
+        if not cache_path.exists():
+            return None
+        try:
+            cached = orjson.loads(cache_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning("Ignoring unreadable analysis cache %s: %s", cache_path, e)
+            return None
+        touch(cache_path)
+        return cached
+    
+    def _store_cached_result(self, cache_path: Path, file_tree: Dict[str, Any],
+                             code_graph: Dict[str, Any], diagram: str, doc_path: str):
+        """Save everything needed to replay this analysis without re-running it"""
+        try:
+            blob = orjson.dumps({
+                'file_tree': file_tree,
+                'code_graph': code_graph,
+                'diagram': diagram,
+                'documentation': Path(doc_path).read_text(encoding='utf-8'),
+            })
+            # Write then rename so concurrent readers never see a partial file
+            atomic_write_bytes(cache_path, blob)
+        except (OSError, TypeError) as e:
+            logger.warning("Could not save analysis cache %s: %s", cache_path, e)
+            return
+        prune_cache(_RESULT_CACHE_DIR, _RESULT_CACHE_MAX_BYTES)
+    
+    def _execute_python_workflow(self, github_url: str) -> Dict[str, Any]:
+        """
+        Python implementation of the workflow
+        This is what currently works
+        """
+        logger.info("🧭 Captain: All hands on deck! Initiating code exploration mission to %s... ⚓", github_url)
+        
+        # Step 1: Clone repository
+        logger.info("🗺️ Navigator: Charting course to digital treasure... 🏴‍☠️")
+        repo_path = self.file_utils.clone_repository(github_url)
+        if not repo_path:
+            raise Exception("💥 Houston, we have a problem! Repository clone failed")
         
-        # Step 7: Save all files
-        print("🎨 Designer: Preserving artifacts in the digital vault... 💎")
         repo_name = os.path.basename(repo_path)
-        doc_path = self.file_utils.save_documentation(documentation, repo_name)
-        file_tree_path = self.file_utils.save_file_tree(file_tree, repo_name)
-        code_graph_path = self.file_utils.save_code_graph(code_graph, repo_name)
-        diagram_path = self.file_utils.save_diagram(diagram, repo_name)
+        # Resolved once; every artifact below is written into it
+        output_path = self.file_utils.ensure_output_dir(repo_name)
+        # Resolved once for every cache this analysis reads or fills
+        sha = head_sha(repo_path)
+        cache_path = self._result_cache_path(github_url, sha)
+        cached = self._load_cached_result(cache_path) if cache_path else None
+        
+        if cached:
+            # Same commit analyzed before: replay its artifacts, skip steps 2-6
+            logger.info("⚡ Captain: We've charted these waters before! Restoring the ship's log... 📖")
+            file_tree, code_graph, diagram = cached['file_tree'], cached['code_graph'], cached['diagram']
+            doc_path = self.file_utils.write_documentation(output_path, cached['documentation'])
+        else:
+            # Steps 2-6: File tree, README summary, code graph, documentation, diagram
+            file_tree, code_graph, diagram, doc_path, fallbacks = asyncio.run_coroutine_threadsafe(
+                self._analyze_async(github_url, repo_path, output_path, sha), self._loop
+            ).result()
+            if fallbacks:
+                # Canned text from a Gemini outage mustn't be replayed for this commit
+                logger.warning("Not caching analysis of %s: Gemini fell back for %s",
+                               github_url, ', '.join(fallbacks))
+                cache_path = None
+        
+        # Step 7: Save all files
+        logger.info("🎨 Designer: Preserving artifacts in the digital vault... 💎")
+        file_tree_path, code_graph_path, diagram_path = self.file_utils.write_artifacts(
+            output_path, file_tree, code_graph, diagram
+        )
+        if cache_path and not cached:
+            self._store_cached_result(cache_path, file_tree, code_graph, diagram, doc_path)
         
         # Step 8: Cleanup cloned repository
-        print("🧹 Janitor: Making everything sparkle and shine... ✨")
+        logger.info("🧹 Janitor: Making everything sparkle and shine... ✨")
         self.file_utils.cleanup_repository(repo_path)
         
-        print("🎉 Mission accomplished! The Intelligent Crew strikes again! 🚀")
+        logger.info("🎉 Mission accomplished for %s! The Intelligent Crew strikes again! 🚀", repo_name)
         
         return {
             "status": "success",
@@ -0,0 +1,46 @@
+"""
+Git-ignored files stay out of the code context graph when the orchestrator
+scans a repository and hands the file list to the parser
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("pathspec")
+
+from abilities import head_sha
+from jac_orchestrator import JacOrchestrator
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    repo_dir = tmp_path / "repo"
+    (repo_dir / "generated").mkdir(parents=True)
+    (repo_dir / ".gitignore").write_text("generated/\nsecrets.py\n")
+    (repo_dir / "app.py").write_text("class App:\n    pass\n")
+    (repo_dir / "secrets.py").write_text("def token():\n    return 'x'\n")
+    (repo_dir / "generated" / "models.py").write_text("def build():\n    pass\n")
+
+    subprocess.run(["git", "init", "-q"], cwd=repo_dir, check=True)
+    subprocess.run(["git", "add", "-f", "."], cwd=repo_dir, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com",
+         "commit", "-q", "-m", "init"],
+        cwd=repo_dir, check=True
+    )
+
+    # Analysis caches are written under ./outputs
+    monkeypatch.chdir(tmp_path)
+    return repo_dir
+
+
+def test_scan_and_build_graph_skips_ignored_files(repo):
+    _, code_graph = JacOrchestrator()._scan_and_build_graph(str(repo), head_sha(str(repo)))
+
+    paths = sorted(module['path'] for module in code_graph['modules'].values())
+    assert paths == ["app.py"]
@@ -0,0 +1,51 @@
+"""
+IncrementalGraph.update_for_files re-parses only the files it is given
+and leaves the graph as a full rebuild would
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.parser import CodeParser
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "app.py").write_text("class App:\n    pass\n\ndef main():\n    pass\n")
+    (tmp_path / "pkg" / "models.py").write_text("class User:\n    pass\n")
+    (tmp_path / "web.js").write_text("function render() {}\n")
+    return tmp_path
+
+
+def test_update_for_files_only_changes_the_edited_file(repo):
+    incremental = CodeParser().build_incremental_graph(str(repo))
+    graph = incremental.graph
+    untouched = {module_id: module for module_id, module in graph['modules'].items()
+                 if module_id != 'app'}
+
+    (repo / "app.py").write_text("def main():\n    pass\n\ndef serve():\n    pass\n")
+    incremental.update_for_files(["app.py"])
+
+    app = graph['modules']['app']
+    assert [node['name'] for node in app['classes'] + app['functions']] == ['main', 'serve']
+    # Other files were not parsed again: their modules are the very same objects
+    for module_id, module in untouched.items():
+        assert graph['modules'][module_id] is module
+    assert graph == CodeParser().build_code_context_graph(str(repo))
+
+
+def test_update_for_files_handles_added_and_deleted_files(repo):
+    incremental = CodeParser().build_incremental_graph(str(repo))
+
+    (repo / "pkg" / "models.py").unlink()
+    (repo / "zz_tasks.py").write_text("def run():\n    pass\n")
+    graph = incremental.update_for_files([repo / "pkg" / "models.py", "zz_tasks.py"])
+
+    assert 'pkg_models' not in graph['modules']
+    assert 'zz_tasks' in graph['modules']
+    assert graph == CodeParser().build_code_context_graph(str(repo))
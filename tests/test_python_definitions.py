@@ -0,0 +1,103 @@
+"""
+CodeParser's ast walk only visits statement bodies, yet must find the same
+definitions, in the same order, as a full ast.walk
+"""
+
+import ast
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.parser import CodeParser
+
+SOURCE = b'''
+class Outer:
+    def method(self):
+        def helper():
+            pass
+
+    class Inner:
+        pass
+
+if True:
+    def in_if():
+        pass
+else:
+    def in_else():
+        pass
+
+for item in []:
+    pass
+else:
+    def in_for_else():
+        pass
+
+while False:
+    def in_while():
+        pass
+
+with open(__file__):
+    def in_with():
+        pass
+
+try:
+    def in_try():
+        pass
+except ImportError:
+    def in_handler():
+        pass
+finally:
+    def in_finally():
+        pass
+
+match 1:
+    case 1:
+        def in_case():
+            pass
+
+value = [lambda: 0 for _ in range(3)]
+'''
+
+
+def walked_definitions(source):
+    class_names, function_names = [], []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ClassDef):
+            class_names.append(node.name)
+        elif isinstance(node, ast.FunctionDef):
+            function_names.append(node.name)
+    return class_names, function_names
+
+
+def test_statement_walk_matches_ast_walk():
+    class_names, function_names = CodeParser()._python_definitions_ast(SOURCE)
+
+    assert (class_names, function_names) == walked_definitions(SOURCE)
+    assert class_names == ['Outer', 'Inner']
+    assert 'helper' in function_names and 'in_case' in function_names
+
+
+def test_type_dispatch_keeps_sync_definitions_only():
+    source = b'''
+import functools
+
+@functools.lru_cache
+def cached():
+    pass
+
+async def fetch():
+    async def inner():
+        pass
+    def sync_inside_async():
+        pass
+
+@decorator
+class Service:
+    async def handle(self):
+        pass
+'''
+    class_names, function_names = CodeParser()._python_definitions_ast(source)
+
+    assert class_names == ['Service']
+    assert function_names == ['cached', 'sync_inside_async']
@@ -0,0 +1,86 @@
+"""
+Disk Cache Helpers for Codebase Genius X
+Atomic writes and size/age-bounded cleanup for the on-disk caches
+"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator
+
+
+# Entries unused for this long are removed whatever the cache size
+CACHE_MAX_AGE_DAYS = float(os.getenv('CACHE_MAX_AGE_DAYS', '30'))
+
+# Pruning stats every entry, so each cache is pruned at most this often per process
+PRUNE_INTERVAL_SECONDS = 600
+
+_last_pruned: Dict[str, float] = {}
+_prune_lock = threading.Lock()
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Iterator[BinaryIO]:
+    """Write to a temp file beside path, renamed over it only once complete"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique name per call: threads of one process never share a temp file
+    f = tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.",
+                                    suffix='.tmp', delete=False)
+    try:
+        with f:
+            yield f
+        os.replace(f.name, path)
+    except BaseException:
+        Path(f.name).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Replace path with data without readers ever seeing a partial file"""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+def touch(path: Path):
+    """Mark a cache entry as used, so pruning evicts it last"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_cache(cache_dir: Path, max_bytes: int, max_age_days: float = CACHE_MAX_AGE_DAYS):
+    """
+    Remove cache files unused for max_age_days, then the least recently
+    used ones until the directory fits in max_bytes
+    """
+    now = time.time()
+    with _prune_lock:
+        if now - _last_pruned.get(str(cache_dir), 0) < PRUNE_INTERVAL_SECONDS:
+            return
+        _last_pruned[str(cache_dir)] = now
+    
+    entries = []
+    for root, _, names in os.walk(cache_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+    
+    cutoff = now - max_age_days * 86400
+    total = sum(size for _, size, _ in entries)
+    entries.sort()
+    for mtime, size, path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
@@ -3,13 +3,88 @@ File Utilities for Codebase Genius X
 Handles Git operations and file system operations
 """
 
-import git
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterable, Tuple
 from urllib.parse import urlparse
 import os
 import json
 import re
+import subprocess
+import tarfile
+import time
+
+import orjson
+
+from utils.disk_cache import atomic_writer, prune_cache, touch
+
+# zstandard is optional; without it every analysis clones from the network
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+# File suffixes that show up in the file tree and feed the analysis
+SCANNED_SUFFIXES = frozenset({'.py', '.js', '.ts', '.tsx', '.jsx', '.jac', '.json', '.md'})
+
+# Languages detected from file suffixes anywhere in the repository
+LANGUAGE_SUFFIXES = {'.py': 'Python', '.java': 'Java', '.go': 'Go', '.rs': 'Rust'}
+
+# package.json dependency -> framework, in increasing precedence
+JS_FRAMEWORKS = {
+    'react': 'React',
+    'vue': 'Vue.js',
+    'angular': 'Angular',
+    'express': 'Express.js',
+    'nestjs': 'NestJS',
+    'fastapi': 'FastAPI',
+}
+
+# requirements.txt package -> framework, in decreasing precedence
+PY_FRAMEWORKS = {'fastapi': 'FastAPI', 'flask': 'Flask', 'django': 'Django'}
+PY_FRAMEWORK_RE = re.compile(rb"^\s*(fastapi|flask|django)\b", re.MULTILINE | re.IGNORECASE)
+
+# Only the head of README/requirements.txt is ever used (the README summary
+# prompt keeps the first 1000 characters), so larger files are not read whole
+MAX_METADATA_READ_BYTES = 64 * 1024
+
+# Dependency, build-output and tool-cache directories. They can hold orders
+# of magnitude more files than the project itself, so the walk never enters
+# them: they're left out of the tree, language detection and the source scan.
+PRUNED_DIRS = frozenset({
+    'node_modules', 'venv', '.venv', 'target', 'dist', 'build', '.next', '.nuxt',
+    'vendor', '__pycache__', '.pytest_cache', '.mypy_cache', '.git', '.tox', 'site-packages',
+})
+
+# Sparse checkout patterns for partial clones: the scanned suffixes plus the
+# files framework detection and dependency extraction (incl. -r includes) read,
+# and the root .gitignore the parser honours
+SPARSE_CHECKOUT_PATTERNS = sorted(f"*{suffix}" for suffix in SCANNED_SUFFIXES) + [
+    '/README*', '/requirements*', '/.gitignore', '*.java', '*.go', '*.rs',
+]
+
+# Clone strategies selectable via the GIT_CLONE_MODE env var. Analysis only
+# needs the HEAD working tree, so the default skips history and tags, defers
+# blob downloads to checkout time and only checks out files we scan.
+CLONE_MODES = {
+    'partial': ['--depth=1', '--filter=blob:none', '--single-branch', '--no-tags', '--sparse'],
+    'shallow': ['--depth=1'],
+    'full': [],
+}
+
+# URL schemes accepted for cloning (comma-separated in CLONE_URL_SCHEMES).
+# Anything else, e.g. ext:: transports or a URL starting with '-' that git
+# would read as an option, is rejected before git ever sees it.
+CLONE_URL_SCHEMES = frozenset(os.getenv('CLONE_URL_SCHEMES', 'https').split(','))
+
+# Snapshots of cloned working trees, keyed by repo, remote HEAD sha and clone
+# mode. Set CLONE_CACHE_DIR to an empty string to disable; CLONE_CACHE_MAX_MB
+# bounds its size, least recently used snapshots going first.
+CLONE_CACHE_DIR = os.getenv('CLONE_CACHE_DIR', str(Path.home() / '.cache' / 'codebasegeniusx'))
+CLONE_CACHE_MAX_BYTES = int(os.getenv('CLONE_CACHE_MAX_MB', '2048')) * 1024 * 1024
 
 
 class FileUtils:
@@ -18,7 +93,7 @@ class FileUtils:
     def clone_repository(self, github_url: str, output_dir: str = "outputs") -> Optional[str]:
         """Clone a GitHub repository"""
         try:
-            parsed = urlparse(github_url)
+            parsed = self._validate_clone_url(github_url)
             path_parts = parsed.path.strip('/').split('/')
             
             if len(path_parts) < 2:
@@ -37,10 +112,36 @@ class FileUtils:
             # Create output directory
             repo_dir.mkdir(parents=True, exist_ok=True)
             
+            clone_mode = os.getenv('GIT_CLONE_MODE', 'partial')
+            clone_options = CLONE_MODES.get(clone_mode, CLONE_MODES['partial'])
+            
+            # Reuse a snapshot of this exact commit if we've cloned it before
+            cache_file = self._clone_cache_path(github_url, repo_name, clone_mode)
+            if cache_file and cache_file.exists() and self._restore_clone(cache_file, repo_dir):
+                print(f"⚡ Found a cached copy of {github_url} at this commit! Skipping the clone! 🏎️")
+                return str(repo_dir)
+            
             # Clone repository
             print(f"🚀 Teleporting code from {github_url} to our secret base... 🏗️")
-            git.Repo.clone_from(github_url, str(repo_dir), depth=1)
-            print(f"✨ Code successfully materialized! Welcome to the digital realm! 🌟")
+            started = time.perf_counter()
+            try:
+                self._git_clone(github_url, repo_dir, clone_options)
+                if '--sparse' in clone_options:
+                    self._sparse_checkout(repo_dir)
+            except subprocess.CalledProcessError as e:
+                if clone_options == CLONE_MODES['shallow']:
+                    raise
+                # Some servers reject partial clone filters; retry the classic way
+                print(f"⚠️ {clone_mode} clone failed ({e.stderr.strip() or e}), retrying with a shallow clone...")
+                import shutil
+                shutil.rmtree(repo_dir, ignore_errors=True)
+                repo_dir.mkdir(parents=True, exist_ok=True)
+                self._git_clone(github_url, repo_dir, CLONE_MODES['shallow'])
+            elapsed = time.perf_counter() - started
+            print(f"✨ Code successfully materialized in {elapsed:.1f}s! Welcome to the digital realm! 🌟")
+            
+            if cache_file:
+                self._store_clone(repo_dir, cache_file)
             
             return str(repo_dir)
         
@@ -48,6 +149,86 @@ class FileUtils:
             print(f"💥 Oops! The teleportation device malfunctioned: {e} 🔧")
             return None
     
+    def _clone_cache_path(self, github_url: str, repo_name: str, clone_mode: str) -> Optional[Path]:
+        """Locate the clone snapshot for the remote's current HEAD, if caching is possible"""
+        if not ZSTD_AVAILABLE or not CLONE_CACHE_DIR:
+            return None
+        try:
+            self._validate_clone_url(github_url)
+            # A few KB over the wire, versus the whole clone; '--' keeps the
+            # URL from being read as an option
+            result = subprocess.run(
+                ['git', 'ls-remote', '--', github_url, 'HEAD'],
+                capture_output=True, text=True, timeout=30, check=True,
+            )
+        except (OSError, subprocess.SubprocessError, ValueError):
+            return None
+        
+        fields = result.stdout.split()
+        if not fields:
+            return None
+        return Path(CLONE_CACHE_DIR) / f"{repo_name}-{fields[0]}-{clone_mode}.tar.zst"
+    
+    def _restore_clone(self, cache_file: Path, repo_dir: Path) -> bool:
+        """Extract a cached clone snapshot into repo_dir"""
+        try:
+            with open(cache_file, 'rb') as f:
+                reader = zstandard.ZstdDecompressor().stream_reader(f)
+                with tarfile.open(fileobj=reader, mode='r|') as tar:
+                    if hasattr(tarfile, 'data_filter'):
+                        tar.extractall(repo_dir, filter='data')
+                    else:
+                        tar.extractall(repo_dir)
+            touch(cache_file)
+            return True
+        except (OSError, tarfile.TarError, zstandard.ZstdError) as e:
+            print(f"⚠️ Cached clone {cache_file.name} is unusable ({e}), cloning fresh...")
+            import shutil
+            shutil.rmtree(repo_dir, ignore_errors=True)
+            repo_dir.mkdir(parents=True, exist_ok=True)
+            cache_file.unlink(missing_ok=True)
+            return False
+    
+    def _store_clone(self, repo_dir: Path, cache_file: Path):
+        """Snapshot a fresh clone into the cache as a zstd-compressed tarball"""
+        # .git is kept so HEAD-keyed analysis caches still recognise the commit
+        try:
+            with atomic_writer(cache_file) as f:
+                writer = zstandard.ZstdCompressor().stream_writer(f, closefd=False)
+                with tarfile.open(fileobj=writer, mode='w|') as tar:
+                    tar.add(repo_dir, arcname='.')
+                writer.close()
+        except (OSError, tarfile.TarError, zstandard.ZstdError) as e:
+            print(f"⚠️ Could not cache clone of {repo_dir.name}: {e}")
+            return
+        prune_cache(cache_file.parent, CLONE_CACHE_MAX_BYTES)
+    
+    def _validate_clone_url(self, github_url: str):
+        """Parse a repository URL, rejecting anything but an allowed scheme with a host"""
+        parsed = urlparse(github_url)
+        if parsed.scheme not in CLONE_URL_SCHEMES or (parsed.scheme != 'file' and not parsed.hostname):
+            raise ValueError(f"Unsupported repository URL: {github_url!r}")
+        return parsed
+    
+    def _git_clone(self, github_url: str, repo_dir: Path, options: List[str]):
+        """Run `git clone` directly; we only need the files on disk, not a Repo handle"""
+        # '--' ends option parsing, so the URL can never be read as a flag
+        subprocess.run(
+            ['git', 'clone', *options, '--', github_url, str(repo_dir)],
+            check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+    
+    def _sparse_checkout(self, repo_dir: Path):
+        """Limit the working tree of a --sparse clone to the files we analyze"""
+        git_dir = ['git', '-C', str(repo_dir), 'sparse-checkout']
+        try:
+            subprocess.run([*git_dir, 'set', '--no-cone', *SPARSE_CHECKOUT_PATTERNS],
+                           check=True, capture_output=True, text=True)
+        except subprocess.CalledProcessError as e:
+            # Older git without --no-cone: fall back to the full working tree
+            print(f"⚠️ Sparse checkout unavailable ({e.stderr.strip()}), checking out everything...")
+            subprocess.run([*git_dir, 'disable'], check=True, capture_output=True, text=True)
+    
     def cleanup_repository(self, repo_path: str):
         """Remove cloned repository files, keeping only generated docs"""
         try:
@@ -62,6 +243,7 @@ class FileUtils:
             keep_files = ['docs.md', 'diagram.mmd', 'code_graph.json', 'file_tree.json']
             
             # Remove everything except keep_files
+            directories = []
             for item in repo_dir.iterdir():
                 if item.name in keep_files:
                     print(f"💎 Keeping precious artifact: {item.name}")
@@ -72,58 +254,128 @@ class FileUtils:
                     item.unlink()
                 elif item.is_dir():
                     print(f"📁 Removing directory {item.name} and all its secrets...")
-                    # Remove all directories
-                    shutil.rmtree(item, ignore_errors=True)
+                    directories.append(item)
+            
+            # Directory removal is dominated by per-file unlink syscalls, so
+            # the top-level trees are removed in parallel
+            if directories:
+                with ThreadPoolExecutor(max_workers=min(8, len(directories))) as pool:
+                    for item in directories:
+                        pool.submit(shutil.rmtree, item, ignore_errors=True)
             
             print(f"🎉 Repository spa treatment complete! Only the finest docs remain! 💅")
             
         except Exception as e:
             print(f"💥 Cleanup crew encountered a snag: {e} 🔧")
     
-    def build_file_tree(self, repo_path: str, max_depth: int = 4) -> Dict[str, Any]:
+    def build_file_tree(self, repo_path: str, max_depth: int = 4,
+                        max_workers: Optional[int] = None) -> Dict[str, Any]:
         """Build a tree representation of the repository"""
+        return self.scan_repository(repo_path, max_depth, max_workers)[0]
+    
+    def scan_repository(self, repo_path: str, max_depth: int = 4,
+                        max_workers: Optional[int] = None) -> Tuple[Dict[str, Any], List[str]]:
+        """Build the file tree and list candidate source files in one walk
+        
+        The source list covers every file with a scanned suffix, including
+        ones in hidden directories or below max_depth, so CodeParser can
+        build the code graph from it instead of walking the repo again.
+        Directories in PRUNED_DIRS are skipped entirely.
+        
+        Top-level directories are walked concurrently on a thread pool so
+        their readdir/stat latency overlaps; pass max_workers=1 to walk
+        everything sequentially.
+        """
         repo_path_obj = Path(repo_path)
+        # Languages seen anywhere in the repo, collected during the same walk
+        # so framework/language detection needs no extra traversal
+        languages_found = set()
+        source_files = []
         
-        def walk_directory(path: Path, depth: int = 0) -> List[Dict]:
-            if depth > max_depth:
-                return []
-            
+        def walk_directory(path: str, rel_path: str, depth: int = 0,
+                           pool: Optional[ThreadPoolExecutor] = None,
+                           visible: bool = True, collect: bool = True) -> List[Dict]:
+            # Below max_depth and inside hidden directories the tree is no
+            # longer listed, but we keep walking (without following symlinks)
+            # to detect languages and collect source files. Symlinked
+            # directories are still listed but never collected from, so a
+            # link back into the repo can't duplicate (or loop) modules.
+            listing = visible and depth <= max_depth
             items = []
             try:
-                for item in sorted(path.iterdir()):
-                    if item.name.startswith('.') or item.name.startswith('__'):
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                return items
+            
+            for entry in entries:
+                name = entry.name
+                hidden = name.startswith('.') or name.startswith('__')
+                
+                if entry.is_dir(follow_symlinks=listing):
+                    if name in PRUNED_DIRS:
                         continue
                     
-                    if item.is_dir():
+                    child_args = (entry.path, os.path.join(rel_path, name), depth + 1)
+                    child_kwargs = {'visible': visible and not hidden,
+                                    'collect': collect and not entry.is_symlink()}
+                    if pool is not None:
+                        # Resolved to a list once the pool finishes
+                        children = pool.submit(walk_directory, *child_args, **child_kwargs)
+                    else:
+                        children = walk_directory(*child_args, **child_kwargs)
+                    if listing and not hidden:
                         items.append({
-                            'name': item.name,
+                            'name': name,
                             'type': 'directory',
-                            'children': walk_directory(item, depth + 1)
+                            'children': children
                         })
-                    elif item.suffix in ['.py', '.js', '.ts', '.tsx', '.jsx', '.jac', '.json', '.md']:
+                    continue
+                
+                suffix = os.path.splitext(name)[1]
+                language = LANGUAGE_SUFFIXES.get(suffix) if collect else None
+                if language:
+                    languages_found.add(language)
+                if suffix in SCANNED_SUFFIXES:
+                    if collect:
+                        source_files.append(entry.path)
+                    if listing and not hidden:
                         items.append({
-                            'name': item.name,
+                            'name': name,
                             'type': 'file',
-                            'path': str(item.relative_to(repo_path))
+                            'path': os.path.join(rel_path, name)
                         })
-            except PermissionError:
-                pass
             
             return items
         
+        if max_workers == 1:
+            children = walk_directory(str(repo_path_obj), '')
+        else:
+            # Subtrees below the top level stay sequential within their worker
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-tree") as pool:
+                children = walk_directory(str(repo_path_obj), '', pool=pool)
+            for item in children:
+                if item['type'] == 'directory':
+                    item['children'] = item['children'].result()
+        
         tree = {
             'name': repo_path_obj.name,
             'type': 'directory',
-            'children': walk_directory(repo_path_obj)
+            'children': children
         }
         
         # Add framework and language detection
-        tree['metadata'] = self._detect_framework_and_language(repo_path_obj)
+        tree['metadata'] = self._detect_framework_and_language(repo_path_obj, languages_found)
         
-        return tree
+        # Workers append in completion order; keep the list deterministic
+        source_files.sort()
+        return tree, source_files
     
-    def _detect_framework_and_language(self, repo_path: Path) -> Dict[str, Any]:
-        """Detect framework and primary language from repository"""
+    def _detect_framework_and_language(self, repo_path: Path, languages_found: set) -> Dict[str, Any]:
+        """Detect framework and primary language from repository
+        
+        languages_found holds the languages build_file_tree saw while walking.
+        """
         metadata = {
             'languages': [],
             'framework': None,
@@ -140,41 +392,34 @@ class FileUtils:
                 
                 deps = data.get('dependencies', {})
                 dev_deps = data.get('devDependencies', {})
-                all_deps = {**deps, **dev_deps}
-                
-                # Detect framework
-                if 'react' in all_deps:
-                    metadata['framework'] = 'React'
-                    if 'vite' in all_deps:
-                        metadata['build_tool'] = 'Vite'
-                    elif 'next' in all_deps:
-                        metadata['framework'] = 'Next.js'
-                    elif 'create-react-app' in all_deps:
-                        metadata['build_tool'] = 'Create React App'
-                
-                if 'vue' in all_deps:
-                    metadata['framework'] = 'Vue.js'
-                
-                if 'angular' in all_deps:
-                    metadata['framework'] = 'Angular'
                 
-                if 'express' in all_deps:
-                    metadata['framework'] = 'Express.js'
+                # Membership across both maps, without merging them into a copy
+                def has(dep: str) -> bool:
+                    return dep in deps or dep in dev_deps
                 
-                if 'nestjs' in all_deps:
-                    metadata['framework'] = 'NestJS'
+                # Detect framework: when several known framework deps are
+                # present, the later entry in JS_FRAMEWORKS wins
+                framework_deps = [dep for dep in JS_FRAMEWORKS if has(dep)]
+                if framework_deps:
+                    metadata['framework'] = JS_FRAMEWORKS[framework_deps[-1]]
                 
-                if 'fastapi' in all_deps:
-                    metadata['framework'] = 'FastAPI'
+                if has('react'):
+                    if has('vite'):
+                        metadata['build_tool'] = 'Vite'
+                    elif has('next'):
+                        if metadata['framework'] == 'React':
+                            metadata['framework'] = 'Next.js'
+                    elif has('create-react-app'):
+                        metadata['build_tool'] = 'Create React App'
                 
                 # Detect TypeScript
-                if 'typescript' in all_deps:
+                if has('typescript'):
                     metadata['languages'].append('TypeScript')
                 else:
                     metadata['languages'].append('JavaScript')
                 
                 # Detect runtime
-                if 'next' in all_deps:
+                if has('next'):
                     metadata['runtime'] = 'Node.js (SSR)'
                 else:
                     metadata['runtime'] = 'Node.js'
@@ -183,37 +428,25 @@ class FileUtils:
                 print(f"Error reading package.json: {e}")
         
         # Check for Python files
-        python_files = list(repo_path.rglob('*.py'))
-        if python_files:
+        if 'Python' in languages_found:
             metadata['languages'].append('Python')
             
             # Check for Python frameworks
             if not metadata['framework']:
                 requirements = repo_path / 'requirements.txt'
                 if requirements.exists():
-                    with open(requirements, 'r') as f:
-                        content = f.read()
-                        if 'fastapi' in content:
-                            metadata['framework'] = 'FastAPI'
-                        elif 'flask' in content:
-                            metadata['framework'] = 'Flask'
-                        elif 'django' in content:
-                            metadata['framework'] = 'Django'
-        
-        # Check for Java files
-        java_files = list(repo_path.rglob('*.java'))
-        if java_files:
-            metadata['languages'].append('Java')
+                    with open(requirements, 'rb') as f:
+                        content = f.read(MAX_METADATA_READ_BYTES)
+                    found = {name.decode().lower() for name in PY_FRAMEWORK_RE.findall(content)}
+                    for name, framework in PY_FRAMEWORKS.items():
+                        if name in found:
+                            metadata['framework'] = framework
+                            break
         
-        # Check for Go files
-        go_files = list(repo_path.rglob('*.go'))
-        if go_files:
-            metadata['languages'].append('Go')
-        
-        # Check for Rust files
-        rust_files = list(repo_path.rglob('*.rs'))
-        if rust_files:
-            metadata['languages'].append('Rust')
+        # Other languages spotted during the walk
+        for language in ('Java', 'Go', 'Rust'):
+            if language in languages_found:
+                metadata['languages'].append(language)
         
         return metadata
     
@@ -226,58 +459,97 @@ class FileUtils:
             readme_path = repo_path_obj / name
             if readme_path.exists():
                 try:
-                    with open(readme_path, 'r', encoding='utf-8') as f:
-                        return f.read()
+                    with open(readme_path, 'rb') as f:
+                        return f.read(MAX_METADATA_READ_BYTES).decode('utf-8', errors='replace')
                 except Exception as e:
                     print(f"Error reading README: {e}")
         
         return ""
     
-    def save_documentation(self, documentation: str, repo_name: str, output_dir: str = "outputs"):
-        """Save documentation to file"""
+    def ensure_output_dir(self, repo_name: str, output_dir: str = "outputs") -> Path:
+        """Create (once) and return the output directory for a repository
+        
+        The write_* methods take this resolved path, so a caller saving
+        several artifacts only pays for one mkdir.
+        """
         output_path = Path(output_dir) / repo_name
         output_path.mkdir(parents=True, exist_ok=True)
+        return output_path
+    
+    def save_documentation(self, documentation: str, repo_name: str, output_dir: str = "outputs"):
+        """Save documentation to file"""
+        return self.write_documentation(self.ensure_output_dir(repo_name, output_dir), documentation)
+    
+    def write_documentation(self, output_path: Path, documentation: str) -> str:
+        """Write docs.md into an existing output directory"""
+        doc_file = output_path / "docs.md"
+        doc_file.write_bytes(documentation.encode('utf-8'))
         
+        print(f"📚 Epic documentation saga saved to {doc_file}! A masterpiece is born! ✨")
+        return str(doc_file)
+    
+    async def write_documentation_stream(self, output_path: Path, chunks: AsyncIterable[str]) -> str:
+        """Stream docs.md into an existing output directory as it is generated"""
         doc_file = output_path / "docs.md"
-        with open(doc_file, 'w', encoding='utf-8') as f:
-            f.write(documentation)
+        # Unbuffered binary file: each chunk goes straight to disk in one
+        # write, keeping docs.md readable while generation is still running.
+        # Disk I/O runs in a worker thread so it never stalls the event loop
+        # shared with the README summary and diagram tasks.
+        f = await asyncio.to_thread(open, doc_file, 'wb', buffering=0)
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk.encode('utf-8'))
+        except BaseException:
+            # Don't leave a truncated docs.md behind to be mistaken for the real one
+            await asyncio.to_thread(f.close)
+            doc_file.unlink(missing_ok=True)
+            raise
+        await asyncio.to_thread(f.close)
         
         print(f"📚 Epic documentation saga saved to {doc_file}! A masterpiece is born! ✨")
         return str(doc_file)
     
+    def write_artifacts(self, output_path: Path, file_tree: Dict[str, Any], code_graph: Dict[str, Any],
+                        diagram_content: str) -> Tuple[str, str, str]:
+        """Write file tree, code graph and diagram into an existing output directory"""
+        return (
+            self._write_file_tree(output_path, file_tree),
+            self._write_code_graph(output_path, code_graph),
+            self._write_diagram(output_path, diagram_content),
+        )
+    
     def save_file_tree(self, file_tree: Dict[str, Any], repo_name: str, output_dir: str = "outputs"):
         """Save file tree as JSON"""
-        output_path = Path(output_dir) / repo_name
-        output_path.mkdir(parents=True, exist_ok=True)
-        
+        return self._write_file_tree(self.ensure_output_dir(repo_name, output_dir), file_tree)
+    
+    def save_code_graph(self, code_graph: Dict[str, Any], repo_name: str, output_dir: str = "outputs"):
+        """Save code graph as JSON"""
+        return self._write_code_graph(self.ensure_output_dir(repo_name, output_dir), code_graph)
+    
+    def save_diagram(self, diagram_content: str, repo_name: str, output_dir: str = "outputs"):
+        """Save Mermaid diagram"""
+        return self._write_diagram(self.ensure_output_dir(repo_name, output_dir), diagram_content)
+    
+    # Each artifact is serialized in memory (JSON via orjson) and written with
+    # a single call rather than streamed through many small json.dump writes
+    
+    def _write_file_tree(self, output_path: Path, file_tree: Dict[str, Any]) -> str:
         file_tree_json = output_path / "file_tree.json"
-        with open(file_tree_json, 'w', encoding='utf-8') as f:
-            json.dump(file_tree, f, indent=2)
+        file_tree_json.write_bytes(orjson.dumps(file_tree, option=orjson.OPT_INDENT_2))
         
         print(f"🌳 Digital forest map saved to {file_tree_json}! Every branch documented! 🍃")
         return str(file_tree_json)
     
-    def save_code_graph(self, code_graph: Dict[str, Any], repo_name: str, output_dir: str = "outputs"):
-        """Save code graph as JSON"""
-        output_path = Path(output_dir) / repo_name
-        output_path.mkdir(parents=True, exist_ok=True)
-        
+    def _write_code_graph(self, output_path: Path, code_graph: Dict[str, Any]) -> str:
         code_graph_json = output_path / "code_graph.json"
-        with open(code_graph_json, 'w', encoding='utf-8') as f:
-            json.dump(code_graph, f, indent=2)
+        code_graph_json.write_bytes(orjson.dumps(code_graph, option=orjson.OPT_INDENT_2))
         
         print(f"🧠 Neural network of code relationships saved to {code_graph_json}! The matrix is complete! 🔗")
         return str(code_graph_json)
     
-    def save_diagram(self, diagram_content: str, repo_name: str, output_dir: str = "outputs"):
-        """Save Mermaid diagram"""
-        output_path = Path(output_dir) / repo_name
-        output_path.mkdir(parents=True, exist_ok=True)
-        
+    def _write_diagram(self, output_path: Path, diagram_content: str) -> str:
         diagram_file = output_path / "diagram.mmd"
-        with open(diagram_file, 'w', encoding='utf-8') as f:
-            f.write(diagram_content)
+        diagram_file.write_bytes(diagram_content.encode('utf-8'))
         
         print(f"🎨 Architectural masterpiece saved to {diagram_file}! Mona Lisa of code diagrams! 🖼️")
         return str(diagram_file)
-
@@ -4,8 +4,9 @@ Handles Gemini API integration for documentation generation
 """
 
 import os
+from functools import lru_cache
 import google.generativeai as genai
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 
 
 class GeminiClient:
@@ -26,27 +27,95 @@ class GeminiClient:
         if not readme_content:
             return "No README found"
         
-        prompt = f"""Summarize the following README in 2-3 sentences:
+        try:
+            response = self.model.generate_content(self._readme_prompt(readme_content))
+            return response.text
+        except Exception as e:
+            print(f"🤖 Gemini AI is taking a coffee break: {e} ☕")
+            return self._fallback_readme_summary(readme_content)
+    
+    async def summarize_readme_async(self, readme_content: str,
+                                     fallbacks: Optional[List[str]] = None) -> str:
+        """Summarize README content without blocking the event loop
+        
+        fallbacks, when given, gets 'readme_summary' appended if Gemini
+        failed and the canned summary was returned instead.
+        """
+        if not readme_content:
+            return "No README found"
+        
+        try:
+            response = await self.model.generate_content_async(self._readme_prompt(readme_content))
+            return response.text
+        except Exception as e:
+            print(f"🤖 Gemini AI is taking a coffee break: {e} ☕")
+            if fallbacks is not None:
+                fallbacks.append('readme_summary')
+            return self._fallback_readme_summary(readme_content)
+    
+    def _readme_prompt(self, readme_content: str) -> str:
+        """Build the README summary prompt"""
+        return f"""Summarize the following README in 2-3 sentences:
 
 {readme_content[:1000]}
 
 Provide a concise summary of what this project does."""
-        
+    
+    def _fallback_readme_summary(self, readme_content: str) -> str:
+        """Fallback to simple summary when Gemini is unavailable"""
+        return f"This project is described in the README. The README contains {len(readme_content)} characters."
+    
+    def generate_documentation(self, context: Dict[str, Any]) -> str:
+        """Generate comprehensive documentation"""
         try:
-            response = self.model.generate_content(prompt)
+            response = self.model.generate_content(self._documentation_prompt(context))
             return response.text
         except Exception as e:
             print(f"🤖 Gemini AI is taking a coffee break: {e} ☕")
-            # Fallback to simple summary
-            return f"This project is described in the README. The README contains {len(readme_content)} characters."
+            return self._fallback_documentation(context)
     
-    def generate_documentation(self, context: Dict[str, Any]) -> str:
-        """Generate comprehensive documentation"""
+    async def generate_documentation_async(self, context: Dict[str, Any]) -> str:
+        """Generate comprehensive documentation without blocking the event loop"""
+        try:
+            response = await self.model.generate_content_async(self._documentation_prompt(context))
+            return response.text
+        except Exception as e:
+            print(f"🤖 Gemini AI is taking a coffee break: {e} ☕")
+            return self._fallback_documentation(context)
+    
+    async def stream_documentation_async(self, context: Dict[str, Any],
+                                         fallbacks: Optional[List[str]] = None) -> AsyncIterator[str]:
+        """Yield documentation text chunks as Gemini produces them
+        
+        fallbacks, when given, gets 'documentation' appended if the
+        template documentation was yielded instead of Gemini's. An error
+        after the first chunk is re-raised.
+        """
+        produced = False
+        try:
+            response = await self.model.generate_content_async(
+                self._documentation_prompt(context), stream=True
+            )
+            async for chunk in response:
+                produced = True
+                yield chunk.text
+        except Exception as e:
+            # Text already streamed can't be taken back: a half-written
+            # document must fail loudly rather than pass for a complete one
+            if produced:
+                raise
+            print(f"🤖 Gemini AI is taking a coffee break: {e} ☕")
+            if fallbacks is not None:
+                fallbacks.append('documentation')
+            yield self._fallback_documentation(context)
+    
+    def _documentation_prompt(self, context: Dict[str, Any]) -> str:
+        """Build the documentation prompt"""
         code_graph = context.get('code_graph', {})
         file_tree = context.get('file_tree', {})
         readme_summary = context.get('readme_summary', '')
         
-        prompt = f"""You are an expert technical writer. Create professional Markdown documentation with the EXACT structure below.
+        return f"""You are an expert technical writer. Create professional Markdown documentation with the EXACT structure below.
 
 Repository: {context.get('repo_url', '[GitHub URL]')}
 Languages: {', '.join(self._detect_languages(file_tree))}
@@ -104,46 +173,42 @@ Create documentation with these EXACT sections in this order:
 [Final thoughts]
 
 Use the exact format shown above. Be professional, clear, and concise."""
+    
+    def _fallback_documentation(self, context: Dict[str, Any]) -> str:
+        """Return enhanced fallback documentation when Gemini is unavailable"""
+        code_graph = context.get('code_graph', {})
+        file_tree = context.get('file_tree', {})
+        repo_name = file_tree.get('name', 'Project')
         
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            print(f"🤖 Gemini AI is taking a coffee break: {e} ☕")
-            # Return enhanced fallback documentation
-            code_graph = context.get('code_graph', {})
-            file_tree = context.get('file_tree', {})
-            repo_name = file_tree.get('name', 'Project')
-            
-            # Extract repo URL from context if available
-            repo_url = context.get('repo_url', '[GitHub URL]')
-            
-            # Get metadata
-            metadata = file_tree.get('metadata', {})
-            languages = metadata.get('languages', []) or self._detect_languages(file_tree)
-            framework = metadata.get('framework', 'Not detected')
-            build_tool = metadata.get('build_tool', '')
-            runtime = metadata.get('runtime', '')
-            
-            # Format framework info
-            framework_info = framework
-            if build_tool:
-                framework_info += f" + {build_tool}"
-            if runtime:
-                framework_info += f" ({runtime})"
-            
-            # Extract dependencies
-            dependencies = code_graph.get('dependencies', [])
-            deps_text = self._format_dependencies(dependencies)
-            
-            # Extract code entities
-            entities_text = self._format_code_entities(code_graph)
-            
-            # Determine installation commands based on framework
-            install_cmd = self._get_install_command(framework, languages, repo_url, repo_name)
-            run_cmd = self._get_run_command(framework, languages)
-            
-            return f"""# 🚀 {repo_name}
+        # Extract repo URL from context if available
+        repo_url = context.get('repo_url', '[GitHub URL]')
+        
+        # Get metadata
+        metadata = file_tree.get('metadata', {})
+        languages = metadata.get('languages', []) or self._detect_languages(file_tree)
+        framework = metadata.get('framework', 'Not detected')
+        build_tool = metadata.get('build_tool', '')
+        runtime = metadata.get('runtime', '')
+        
+        # Format framework info
+        framework_info = framework
+        if build_tool:
+            framework_info += f" + {build_tool}"
+        if runtime:
+            framework_info += f" ({runtime})"
+        
+        # Extract dependencies
+        dependencies = code_graph.get('dependencies', [])
+        deps_text = self._format_dependencies(dependencies)
+        
+        # Extract code entities
+        entities_text = self._format_code_entities(code_graph)
+        
+        # Determine installation commands based on framework
+        install_cmd = self._get_install_command(framework, languages, repo_url, repo_name)
+        run_cmd = self._get_run_command(framework, languages)
+        
+        return f"""# 🚀 {repo_name}
 *Where Innovation Meets Implementation*
 
 <div align="center">
@@ -315,10 +380,10 @@ This codebase represents more than just functional software—it's a digital nar
         if not code_graph:
             return "No code entities found"
         
-        nodes = code_graph.get('nodes', [])
-        classes = [n for n in nodes if n.get('type') == 'class']
-        functions = [n for n in nodes if n.get('type') == 'function']
-        components = [n for n in nodes if n.get('type') == 'component']
+        by_type = self._nodes_by_type(code_graph.get('nodes', []))
+        classes = by_type['class']
+        functions = by_type['function']
+        components = by_type['component']
         
         output = []
         
@@ -339,6 +404,15 @@ This codebase represents more than just functional software—it's a digital nar
         
         return "\n".join(output) if output else "No code entities found"
     
+    def _nodes_by_type(self, nodes: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Split code graph nodes into class/function/component lists in one pass"""
+        by_type = {'class': [], 'function': [], 'component': []}
+        for node in nodes:
+            group = by_type.get(node.get('type'))
+            if group is not None:
+                group.append(node)
+        return by_type
+    
     def _detect_languages(self, file_tree: Dict) -> list:
         """Detect programming languages from file tree"""
         languages = set()
@@ -379,9 +453,10 @@ This codebase represents more than just functional software—it's a digital nar
         language_stats = code_graph.get('language_stats', {})
         
         # Group nodes by type for better visualization
-        components = [n for n in nodes if n.get('type') == 'component']
-        classes = [n for n in nodes if n.get('type') == 'class']
-        functions = [n for n in nodes if n.get('type') == 'function']
+        by_type = self._nodes_by_type(nodes)
+        components = by_type['component']
+        classes = by_type['class']
+        functions = by_type['function']
         
         # Start with creative diagram structure
         project_name = file_tree.get('name', 'Project')
@@ -675,3 +750,8 @@ python api.py
 # Check the README or project-specific documentation
 ```"""
 
+
+@lru_cache(maxsize=1)
+def get_gemini_client() -> GeminiClient:
+    """Process-wide GeminiClient, so all callers share one SDK connection pool"""
+    return GeminiClient()
@@ -4,180 +4,476 @@ Handles parsing of Python, JavaScript, TypeScript files using AST and Tree-sitte
 """
 
 import ast
+import atexit
+import hashlib
+import logging
+import mmap
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-import json
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Set, Tuple, Union
 import re
 
+import orjson
+
+from utils.disk_cache import atomic_write_bytes, touch
+
+# tree-sitter's Python grammar covers files the stdlib ast rejects (Python 2,
+# syntax newer than the running interpreter)
+try:
+    import tree_sitter_python
+    from tree_sitter import Language, Parser
+    PYTHON_LANGUAGE = Language(tree_sitter_python.language())
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+# PEP 508 requirement parsing; without it only name==version pins are split
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+    PACKAGING_AVAILABLE = True
+except ImportError:
+    PACKAGING_AVAILABLE = False
+
+# .gitignore matching for local checkouts; SKIP_DIRS alone applies without it
+try:
+    import pathspec
+    PATHSPEC_AVAILABLE = True
+except ImportError:
+    PATHSPEC_AVAILABLE = False
+
+# JavaScript/TypeScript grammars, keyed by dialect; regexes are the fallback
+try:
+    import tree_sitter_javascript
+    import tree_sitter_typescript
+    from tree_sitter import Language, Parser
+    JS_LANGUAGES = {
+        'javascript': Language(tree_sitter_javascript.language()),
+        'typescript': Language(tree_sitter_typescript.language_typescript()),
+        'tsx': Language(tree_sitter_typescript.language_tsx()),
+    }
+    JS_TREE_SITTER_AVAILABLE = True
+except ImportError:
+    JS_TREE_SITTER_AVAILABLE = False
+
+# tree-sitter node types holding JS/TS definitions
+JS_FUNCTION_NODES = frozenset({'function_declaration', 'generator_function_declaration'})
+JS_CLASS_NODES = frozenset({'class_declaration', 'abstract_class_declaration'})
+JS_NAMED_EXPORT_NODES = JS_FUNCTION_NODES | JS_CLASS_NODES | {'interface_declaration', 'type_alias_declaration'}
+
+# Source file globs and their language, in the order modules enter the graph
+SOURCE_GLOBS = [
+    ('*.py', 'Python'),
+    ('*.js', 'JavaScript'),
+    ('*.jsx', 'JavaScript'),
+    ('*.ts', 'TypeScript'),
+    ('*.tsx', 'TypeScript'),
+]
+
+# Source file suffix -> (position in SOURCE_GLOBS, language), so one suffix
+# lookup both selects a file and orders it
+SOURCE_SUFFIXES = {pattern[1:]: (rank, language) for rank, (pattern, language) in enumerate(SOURCE_GLOBS)}
+
+# Directories never descended into when looking for source files
+SKIP_DIRS = frozenset({'__pycache__', 'venv', '.venv', 'node_modules', '.git', 'dist', 'build'})
+
+# ast fields holding statements (or handlers/match cases wrapping them)
+STATEMENT_FIELDS = frozenset({'body', 'orelse', 'finalbody', 'handlers', 'cases'})
+
+# Files this large are memory-mapped rather than read into a bytes copy
+MMAP_MIN_BYTES = 1 << 20
+
+# Raw file contents: bytes, or an mmap for large files
+Source = Union[bytes, mmap.mmap]
+
+# Below this many files, process pool start-up and pickling outweigh the gain
+PARALLEL_MIN_FILES = 8
+
+# JS/TS structure patterns (run over raw file bytes), compiled once at import
+IMPORT_RE = re.compile(rb"import\s+(?:.*?\s+from\s+)?['\"]([^'\"]+)['\"]")
+EXPORT_RE = re.compile(rb"export\s+(?:default\s+)?(?:class|function|const|let|var|interface|type)\s+(\w+)")
+CLASS_RE = re.compile(rb"(?:export\s+)?class\s+(\w+)")
+JS_FUNCTION_RE = re.compile(rb"(?:export\s+)?(?:async\s+)?function\s+(\w+)\s*\(")
+JS_ARROW_RE = re.compile(rb"(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>")
+# TypeScript functions may have generics; arrows may carry a type annotation
+TS_FUNCTION_RE = re.compile(rb"(?:export\s+)?(?:async\s+)?function\s+(\w+)\s*[<\(]")
+TS_ARROW_RE = re.compile(rb"(?:export\s+)?(?:const|let|var)\s+(\w+)\s*[:=]\s*(?:[^=]*)?=>\s*\{")
+# React components: export const ComponentName = ({ ... }) => {
+COMPONENT_RE = re.compile(rb"(?:export\s+)?(?:const|function)\s+(\w+)\s*[:=].*?=>\s*\{")
+# TSX components: the arrow form above, or export const ComponentName: React.FC<Props> = ...
+TS_COMPONENT_RE = re.compile(rb"(?:export\s+)?(?:const|function)\s+(\w+)\s*(?::\s*React\.FC|[:=].*?=>\s*\{)")
+
+# Literal text every match of a pattern must contain. Files without it skip
+# that regex entirely: a substring check is a fast C scan, while a regex pass
+# costs far more per byte, and most files lack most constructs.
+PATTERN_TRIGGERS = {
+    IMPORT_RE: b'import',
+    EXPORT_RE: b'export',
+    CLASS_RE: b'class',
+    JS_FUNCTION_RE: b'function',
+    JS_ARROW_RE: b'=>',
+    TS_FUNCTION_RE: b'function',
+    TS_ARROW_RE: b'=>',
+    COMPONENT_RE: b'=>',
+    TS_COMPONENT_RE: b'=>',
+}
+
+
+def _findall(pattern: re.Pattern, source: Source) -> List[str]:
+    """pattern.findall(source) decoded to str, skipped when its trigger text is absent"""
+    if source.find(PATTERN_TRIGGERS[pattern]) == -1:
+        return []
+    return [match.decode('utf-8', 'replace') for match in pattern.findall(source)]
+
+@lru_cache(maxsize=None)
+def _statement_fields(node_type: type) -> Tuple[str, ...]:
+    """An ast node type's STATEMENT_FIELDS, in field order"""
+    return tuple(field for field in node_type._fields if field in STATEMENT_FIELDS)
+
+logger = logging.getLogger(__name__)
+
+# The tree-sitter Python grammar is quadratic in long runs of comment lines,
+# so a fallback parse is abandoned (the file skipped) after this many seconds
+PYTHON_FALLBACK_PARSE_SECONDS = 2.0
+TREE_SITTER_READ_BYTES = 64 * 1024
+
+# Per-file parse results cached by content hash; bump when the module format changes
+AST_CACHE_VERSION = 3
+
+# In-memory parse results kept per (path, mtime, size), least recently used evicted first
+MODULE_CACHE_SIZE = 4096
+
 
 class CodeParser:
     """Parser for building Code Context Graph"""
     
-    def __init__(self):
-        self.language_stats = {}
+    def __init__(self, verbose: bool = False):
+        # verbose: narrate every .tsx file rather than one summary per build
+        self.verbose = verbose
+        self._ts_parser = None
+        self._js_parsers = {}
+        self._module_cache: "OrderedDict[Tuple[str, str, str, int, int], Optional[Dict[str, Any]]]" = OrderedDict()
+        # One parser serves concurrent analyses; the LRU's reordering isn't thread-safe
+        self._module_cache_lock = threading.Lock()
     
-    def build_code_context_graph(self, repo_path: str) -> Dict[str, Any]:
-        """Build Code Context Graph from repository"""
-        graph = {
-            "nodes": [],
-            "edges": [],
-            "modules": {},
-            "language_stats": {},
-            "dependencies": []
-        }
-        
+    def build_code_context_graph(self, repo_path: str,
+                                 files: Optional[Iterable[str]] = None,
+                                 cache_dir: Optional[Path] = None) -> Dict[str, Any]:
+        """Build Code Context Graph from repository
+        
+        files, when given (e.g. from FileUtils.scan_repository), lists the
+        candidate source paths so the repository isn't walked again.
+        cache_dir, when given, holds per-file parse results keyed by a hash
+        of each file's path and content, so unchanged files skip parsing.
+        Files whose mtime and size haven't changed since this parser last
+        saw them aren't even read again (see clear_cache).
+        """
+        return self.build_incremental_graph(repo_path, files, cache_dir).graph
+    
+    def build_incremental_graph(self, repo_path: str,
+                                files: Optional[Iterable[str]] = None,
+                                cache_dir: Optional[Path] = None) -> "IncrementalGraph":
+        """Build the Code Context Graph as an IncrementalGraph, for later
+        refreshes via update_for_files (arguments as for build_code_context_graph)"""
         repo_path_obj = Path(repo_path)
+        incremental = IncrementalGraph(self, repo_path_obj, cache_dir)
+        
+        # Detect files by language, then parse them (in parallel for larger repos)
+        jobs = self._collect_source_files(repo_path_obj, files)
+        results = self._parse_files(jobs, cache_dir)
+        
+        tsx_stats = {'files': 0, 'components': 0, 'functions': 0, 'classes': 0}
+        
+        for (file_path, rel_path, language), module_data in zip(jobs, results):
+            if module_data and file_path.suffix == '.tsx':
+                components_count = len(module_data.get('components', []))
+                functions_count = len(module_data.get('functions', []))
+                classes_count = len(module_data.get('classes', []))
+                tsx_stats['files'] += 1
+                tsx_stats['components'] += components_count
+                tsx_stats['functions'] += functions_count
+                tsx_stats['classes'] += classes_count
+                
+                if self.verbose:
+                    print(f"🔬 Analyzing React+TypeScript magic in: {file_path}")
+                    if components_count > 0:
+                        print(f"🎭 Discovered {components_count} React components - the stars of the show!")
+                    if functions_count > 0:
+                        print(f"⚙️ Found {functions_count} functions - the hardworking crew!")
+                    if classes_count > 0:
+                        print(f"🏛️ Spotted {classes_count} classes - the architectural masterpieces!")
+            
+            incremental._append(rel_path, (file_path, language, _intern_module(module_data)))
         
-        # Detect and parse files by language
-        self._parse_python_files(repo_path_obj, repo_path, graph)
-        self._parse_javascript_files(repo_path_obj, repo_path, graph)
-        self._parse_typescript_files(repo_path_obj, repo_path, graph)
+        if tsx_stats['files']:
+            logger.info("🔬 React+TypeScript magic in %d .tsx files: 🎭 %d components, "
+                        "⚙️ %d functions, 🏛️ %d classes", tsx_stats['files'],
+                        tsx_stats['components'], tsx_stats['functions'], tsx_stats['classes'])
         
         # Extract dependencies
-        graph['dependencies'] = self._extract_dependencies(repo_path_obj)
+        incremental.graph['dependencies'] = self._extract_dependencies(repo_path_obj)
         
-        # Add language statistics
-        graph['language_stats'] = self.language_stats
-        
-        return graph
+        return incremental
     
-    def _parse_python_files(self, repo_path_obj: Path, repo_path: str, graph: Dict):
-        """Parse Python files"""
-        for py_file in repo_path_obj.rglob('*.py'):
-            if self._should_skip_file(py_file):
-                continue
-            
-            try:
-                module_data = self._parse_python_file(py_file, repo_path_obj)
-                if module_data:
-                    module_id = module_data['id']
-                    graph['modules'][module_id] = module_data
-                    graph['nodes'].extend(module_data['classes'])
-                    graph['nodes'].extend(module_data['functions'])
-                    self.language_stats['Python'] = self.language_stats.get('Python', 0) + 1
-            except Exception as e:
-                print(f"Error parsing {py_file}: {e}")
-                continue
-        
-    def _parse_javascript_files(self, repo_path_obj: Path, repo_path: str, graph: Dict):
-        """Parse JavaScript files"""
-        # Parse .js files
-        for js_file in repo_path_obj.rglob('*.js'):
-            if self._should_skip_file(js_file):
+    def _collect_source_files(self, repo_path_obj: Path,
+                              files: Optional[Iterable[str]] = None) -> List[Tuple[Path, str, str]]:
+        """List parseable source files with their repo-relative path and language, in graph order"""
+        # The walk prunes skipped and git-ignored paths itself; only given
+        # lists need filtering
+        walked = files is None
+        if walked:
+            files = self._walk_source_files(repo_path_obj)
+            ignore_spec = None
+        else:
+            ignore_spec = self._load_ignore_spec(repo_path_obj)
+        
+        # Group by language, in SOURCE_GLOBS order
+        ranked = []
+        for path in files:
+            file_path = Path(path)
+            if file_path.suffix in SOURCE_SUFFIXES:
+                rank, language = SOURCE_SUFFIXES[file_path.suffix]
+                ranked.append((rank, file_path, language))
+        ranked.sort(key=lambda item: item[0])
+        candidates = [(file_path, language) for _, file_path, language in ranked]
+        
+        root_prefix = os.path.join(str(repo_path_obj), '')
+        jobs = []
+        for file_path, language in candidates:
+            if not walked and self._should_skip_file(file_path):
                 continue
             
-            try:
-                module_data = self._parse_javascript_file(js_file, repo_path_obj)
-                if module_data:
-                    module_id = module_data['id']
-                    graph['modules'][module_id] = module_data
-                    graph['nodes'].extend(module_data['classes'])
-                    graph['nodes'].extend(module_data['functions'])
-                    graph['nodes'].extend(module_data.get('components', []))
-                    self.language_stats['JavaScript'] = self.language_stats.get('JavaScript', 0) + 1
-            except Exception as e:
-                print(f"Error parsing {js_file}: {e}")
-                continue
-        
-        # Parse .jsx files
-        for jsx_file in repo_path_obj.rglob('*.jsx'):
-            if self._should_skip_file(jsx_file):
+            # Skip .d.ts files
+            if file_path.suffixes == ['.d', '.ts']:
                 continue
             
-            try:
-                module_data = self._parse_javascript_file(jsx_file, repo_path_obj)
-                if module_data:
-                    module_id = module_data['id']
-                    graph['modules'][module_id] = module_data
-                    graph['nodes'].extend(module_data['classes'])
-                    graph['nodes'].extend(module_data['functions'])
-                    graph['nodes'].extend(module_data.get('components', []))
-                    self.language_stats['JavaScript'] = self.language_stats.get('JavaScript', 0) + 1
-            except Exception as e:
-                print(f"Error parsing {jsx_file}: {e}")
-                continue
-    
-    def _parse_typescript_files(self, repo_path_obj: Path, repo_path: str, graph: Dict):
-        """Parse TypeScript files"""
-        # Parse .ts files
-        for ts_file in repo_path_obj.rglob('*.ts'):
-            if self._should_skip_file(ts_file):
-                continue
+            # Every later step (cache keys, module ids) needs the relative path;
+            # derive it once, by prefix slicing rather than Path.relative_to
+            path_str = str(file_path)
+            if path_str.startswith(root_prefix):
+                rel_path = path_str[len(root_prefix):]
+            else:
+                try:
+                    rel_path = str(file_path.relative_to(repo_path_obj))
+                except ValueError:
+                    logger.warning("Skipping %s: not inside %s", file_path, repo_path_obj)
+                    continue
             
-            # Skip .d.ts files
-            if ts_file.suffixes == ['.d', '.ts']:
+            if ignore_spec is not None and ignore_spec.match_file(rel_path):
                 continue
             
+            jobs.append((file_path, rel_path, language))
+        
+        return jobs
+    
+    def _walk_source_files(self, repo_path_obj: Path) -> List[str]:
+        """Find source files in one pass, pruning skipped and git-ignored directories whole"""
+        ignore_spec = self._load_ignore_spec(repo_path_obj)
+        found = []
+        # (absolute dir, dir relative to the repo root with a trailing '/')
+        stack = [(str(repo_path_obj), '')]
+        while stack:
+            dir_path, rel_dir = stack.pop()
             try:
-                module_data = self._parse_typescript_file(ts_file, repo_path_obj)
-                if module_data:
-                    module_id = module_data['id']
-                    graph['modules'][module_id] = module_data
-                    graph['nodes'].extend(module_data['classes'])
-                    graph['nodes'].extend(module_data['functions'])
-                    graph['nodes'].extend(module_data.get('components', []))
-                    self.language_stats['TypeScript'] = self.language_stats.get('TypeScript', 0) + 1
-            except Exception as e:
-                print(f"Error parsing {ts_file}: {e}")
+                with os.scandir(dir_path) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in SKIP_DIRS:
+                                continue
+                            rel_path = f"{rel_dir}{entry.name}/"
+                            if ignore_spec is None or not ignore_spec.match_file(rel_path):
+                                stack.append((entry.path, rel_path))
+                        elif os.path.splitext(entry.name)[1] in SOURCE_SUFFIXES:
+                            if ignore_spec is None or not ignore_spec.match_file(rel_dir + entry.name):
+                                found.append(entry.path)
+            except OSError:
                 continue
         
-        # Parse .tsx files
-        for tsx_file in repo_path_obj.rglob('*.tsx'):
-            if self._should_skip_file(tsx_file):
-                continue
+        found.sort()
+        return found
+    
+    def _load_ignore_spec(self, repo_path_obj: Path) -> Optional["pathspec.GitIgnoreSpec"]:
+        """The repository's root .gitignore as a matcher, or None if absent or unusable"""
+        if not PATHSPEC_AVAILABLE:
+            return None
+        try:
+            with open(repo_path_obj / '.gitignore', 'r', encoding='utf-8', errors='replace') as f:
+                return pathspec.GitIgnoreSpec.from_lines(f)
+        except OSError:
+            return None
+    
+    def clear_cache(self):
+        """Forget in-memory parse results, e.g. after files were rewritten in place"""
+        with self._module_cache_lock:
+            self._module_cache.clear()
+    
+    def invalidate(self, file_path: Union[str, Path]):
+        """Forget one file's in-memory parse result so it is read again next time"""
+        resolved = str(Path(file_path).resolve())
+        with self._module_cache_lock:
+            for key in [key for key in self._module_cache if key[0] == resolved]:
+                del self._module_cache[key]
+    
+    def _module_cache_key(self, file_path: Path, rel_path: str,
+                          language: str) -> Optional[Tuple[str, str, str, int, int]]:
+        """(resolved path, relative path, language, mtime, size) key, or None if unstat-able"""
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        # The relative path is part of the key since module ids are derived from it
+        return (str(file_path.resolve()), rel_path, language,
+                st.st_mtime_ns, st.st_size)
+    
+    def _parse_files(self, jobs: List[Tuple[Path, str, str]],
+                     cache_dir: Optional[Path] = None) -> List[Optional[Dict[str, Any]]]:
+        """Parse files not seen unchanged before, reusing earlier results for the rest"""
+        module_cache = self._module_cache
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        keys = [self._module_cache_key(file_path, rel_path, language)
+                for file_path, rel_path, language in jobs]
+        pending = []
+        with self._module_cache_lock:
+            for index, key in enumerate(keys):
+                if key is not None and key in module_cache:
+                    module_cache.move_to_end(key)
+                    results[index] = module_cache[key]
+                else:
+                    pending.append(index)
+        
+        parsed = self._parse_uncached([jobs[index] for index in pending], cache_dir)
+        with self._module_cache_lock:
+            for index, module_data in zip(pending, parsed):
+                results[index] = module_data
+                if keys[index] is not None:
+                    module_cache[keys[index]] = module_data
+            while len(module_cache) > MODULE_CACHE_SIZE:
+                module_cache.popitem(last=False)
+        
+        return results
+    
+    def _parse_uncached(self, jobs: List[Tuple[Path, str, str]],
+                        cache_dir: Optional[Path] = None) -> List[Optional[Dict[str, Any]]]:
+        """Parse files sequentially, or across a process pool for larger repos"""
+        if len(jobs) < PARALLEL_MIN_FILES:
+            return [self._parse_file(file_path, rel_path, language, cache_dir)
+                    for file_path, rel_path, language in jobs]
+        
+        workers = os.cpu_count() or 1
+        # ~4 chunks per worker balances uneven file sizes against IPC overhead
+        chunksize = max(1, len(jobs) // (workers * 4))
+        try:
+            return list(_parse_pool().map(
+                _parse_file_job,
+                [(file_path, rel_path, language, cache_dir) for file_path, rel_path, language in jobs],
+                chunksize=chunksize
+            ))
+        except (OSError, BrokenProcessPool) as e:
+            _discard_parse_pool()
+            logger.warning("Parallel parsing unavailable (%s), parsing sequentially", e)
+            return [self._parse_file(file_path, rel_path, language, cache_dir)
+                    for file_path, rel_path, language in jobs]
+    
+    def _parse_file(self, file_path: Path, rel_path: str, language: str,
+                    cache_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+        """Parse a single source file, returning None if it can't be parsed"""
+        try:
+            # Read once: the same bytes feed the cache key and the parser
+            with self._read_source(file_path) as source:
+                cache_path = None
+                if cache_dir is not None:
+                    cache_path = self._ast_cache_path(cache_dir, rel_path, language, source)
+                    cached = self._load_ast_cache(cache_path)
+                    if cached is not None:
+                        return cached
+                
+                if language == 'Python':
+                    module_data = self._parse_python_file(file_path, rel_path, source)
+                elif language == 'JavaScript':
+                    module_data = self._parse_javascript_file(file_path, rel_path, source)
+                else:
+                    module_data = self._parse_typescript_file(file_path, rel_path, source)
             
+            if cache_path is not None and module_data:
+                self._store_ast_cache(cache_path, module_data)
+            return module_data
+        except Exception as e:
+            logger.warning("Error parsing %s: %s", file_path, e)
+            return None
+    
+    @contextmanager
+    def _read_source(self, file_path: Path) -> Iterator[Source]:
+        """File contents as bytes, or memory-mapped when large (e.g. bundles)"""
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+                yield f.read()
+                return
+            # Pages are read in on demand and never copied into a bytes object
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
             try:
-                print(f"🔬 Analyzing React+TypeScript magic in: {tsx_file}")
-                module_data = self._parse_typescript_file(tsx_file, repo_path_obj)
-                if module_data:
-                    components_count = len(module_data.get('components', []))
-                    functions_count = len(module_data.get('functions', []))
-                    classes_count = len(module_data.get('classes', []))
-                    
-                    if components_count > 0:
-                        print(f"🎭 Discovered {components_count} React components - the stars of the show!")
-                    if functions_count > 0:
-                        print(f"⚙️ Found {functions_count} functions - the hardworking crew!")
-                    if classes_count > 0:
-                        print(f"🏛️ Spotted {classes_count} classes - the architectural masterpieces!")
-                    module_id = module_data['id']
-                    graph['modules'][module_id] = module_data
-                    graph['nodes'].extend(module_data['classes'])
-                    graph['nodes'].extend(module_data['functions'])
-                    graph['nodes'].extend(module_data.get('components', []))
-                    self.language_stats['TypeScript'] = self.language_stats.get('TypeScript', 0) + 1
-            except Exception as e:
-                print(f"Error parsing {tsx_file}: {e}")
-                continue
+                yield source
+            finally:
+                source.close()
+    
+    def _ast_cache_path(self, cache_dir: Path, rel_path: str, language: str,
+                        source: Source) -> Path:
+        """Cache location for a file, keyed by its repo-relative path and content"""
+        digest = hashlib.blake2b(digest_size=16)
+        # The path is part of the key since module ids are derived from it
+        digest.update(f"v{AST_CACHE_VERSION}|{language}|{rel_path}|".encode())
+        digest.update(source)
+        key = digest.hexdigest()
+        return Path(cache_dir) / key[:2] / f"{key}.json"
+    
+    def _load_ast_cache(self, cache_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            module_data = orjson.loads(cache_path.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        touch(cache_path)
+        return module_data
+    
+    def _store_ast_cache(self, cache_path: Path, module_data: Dict[str, Any]):
+        try:
+            # Write then rename so concurrent workers never see a partial file
+            atomic_write_bytes(cache_path, orjson.dumps(module_data))
+        except OSError as e:
+            logger.warning("Could not cache parse of %s: %s", cache_path.name, e)
     
-    def _parse_python_file(self, file_path: Path, repo_path: Path) -> Dict[str, Any]:
-        """Parse a Python file and extract structure"""
-        rel_path = str(file_path.relative_to(repo_path))
+    def _parse_python_file(self, file_path: Path, rel_path: str, source: Source) -> Dict[str, Any]:
+        """Parse a Python file's source and extract structure"""
         module_id = rel_path.replace('/', '_').replace('.py', '')
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        tree = ast.parse(content)
-        
-        classes = []
-        functions = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                classes.append({
-                    'id': f"{module_id}.{node.name}",
-                    'type': 'class',
-                    'name': node.name,
-                    'module': module_id
-                })
-            elif isinstance(node, ast.FunctionDef):
-                functions.append({
-                    'id': f"{module_id}.{node.name}",
-                    'type': 'function',
-                    'name': node.name,
-                    'module': module_id
-                })
+        # ast is faster on real code and linear on any input; tree-sitter only
+        # gets the files it can't parse
+        try:
+            class_names, function_names = self._python_definitions_ast(source)
+        except (SyntaxError, ValueError):
+            if not TREE_SITTER_AVAILABLE:
+                raise
+            class_names, function_names = self._python_definitions_tree_sitter(source)
+        
+        classes = [{
+            'id': f"{module_id}.{name}",
+            'type': 'class',
+            'name': name,
+            'module': module_id
+        } for name in class_names]
+        
+        functions = [{
+            'id': f"{module_id}.{name}",
+            'type': 'function',
+            'name': name,
+            'module': module_id
+        } for name in function_names]
         
         return {
             'id': module_id,
@@ -186,79 +482,144 @@ class CodeParser:
             'functions': functions
         }
     
-    def _parse_javascript_file(self, file_path: Path, repo_path: Path) -> Dict[str, Any]:
-        """Parse a JavaScript file and extract structure"""
-        rel_path = str(file_path.relative_to(repo_path))
+    def _python_definitions_ast(self, source: Source) -> Tuple[List[str], List[str]]:
+        """Collect class and (sync) function names with the stdlib ast"""
+        class_names = []
+        function_names = []
+        # One type() lookup per node instead of a chain of isinstance calls
+        names_by_type = {ast.ClassDef: class_names, ast.FunctionDef: function_names}
+        
+        # Breadth-first like ast.walk, but definitions only live in statement
+        # bodies, so expressions (the bulk of any AST) are never visited
+        queue = deque([ast.parse(bytes(source))])
+        while queue:
+            node = queue.popleft()
+            node_type = type(node)
+            names = names_by_type.get(node_type)
+            if names is not None:
+                names.append(node.name)
+            for field in _statement_fields(node_type):
+                queue.extend(getattr(node, field))
+        
+        return class_names, function_names
+    
+    def _python_definitions_tree_sitter(self, source: Source) -> Tuple[List[str], List[str]]:
+        """Collect class and (sync) function names with tree-sitter"""
+        if self._ts_parser is None:
+            self._ts_parser = Parser(PYTHON_LANGUAGE)
+        
+        # Feed the source in chunks, cutting it short once the deadline passes
+        deadline = time.perf_counter() + PYTHON_FALLBACK_PARSE_SECONDS
+        timed_out = False
+        
+        def read(offset: int, _point) -> bytes:
+            nonlocal timed_out
+            if time.perf_counter() > deadline:
+                timed_out = True
+                return b''
+            return source[offset:offset + TREE_SITTER_READ_BYTES]
+        
+        root = self._ts_parser.parse(read).root_node
+        if timed_out:
+            raise SyntaxError(f"Python parse gave up after {PYTHON_FALLBACK_PARSE_SECONDS}s")
+        if root.has_error:
+            # Match ast.parse, which rejects files with syntax errors
+            raise SyntaxError("invalid Python syntax")
+        
+        class_names = []
+        function_names = []
+        
+        # Breadth-first, like ast.walk
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            if node.type == 'class_definition':
+                class_names.append(node.child_by_field_name('name').text.decode('utf-8'))
+            elif node.type == 'function_definition' and node.children[0].type != 'async':
+                function_names.append(node.child_by_field_name('name').text.decode('utf-8'))
+            queue.extend(node.named_children)
+        
+        return class_names, function_names
+    
+    def _parse_javascript_file(self, file_path: Path, rel_path: str, source: Source) -> Dict[str, Any]:
+        """Parse a JavaScript file's source and extract structure"""
         module_id = rel_path.replace('/', '_').replace('.js', '').replace('.jsx', '')
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-            return None
-        
-        functions = []
-        classes = []
-        components = []
-        imports = []
-        exports = []
-        
-        # Extract imports - more comprehensive pattern
-        import_pattern = r"import\s+(?:.*?\s+from\s+)?['\"]([^'\"]+)['\"]"
-        imports = re.findall(import_pattern, content)
-        
-        # Extract exports - improved pattern
-        export_pattern = r"export\s+(?:default\s+)?(?:class|function|const|let|var|interface|type)\s+(\w+)"
-        exports_found = re.findall(export_pattern, content)
-        exports.extend(exports_found)
-        
-        # Extract functions - including async
-        func_pattern = r"(?:export\s+)?(?:async\s+)?function\s+(\w+)\s*\("
-        functions_found = re.findall(func_pattern, content)
-        for func_name in functions_found:
-            functions.append({
-                'id': f"{module_id}.{func_name}",
-                'type': 'function',
-                'name': func_name,
-                'module': module_id
-            })
+        if JS_TREE_SITTER_AVAILABLE:
+            imports, exports, function_names, class_names, component_names = \
+                self._js_definitions_tree_sitter(source, 'javascript')
+        else:
+            content = self._normalize_newlines(source)
+            
+            # Extract imports and exports
+            imports = _findall(IMPORT_RE, content)
+            exports = _findall(EXPORT_RE, content)
+            
+            # Extract functions - including async and arrow functions
+            function_names = _findall(JS_FUNCTION_RE, content) + _findall(JS_ARROW_RE, content)
+            
+            # Extract classes
+            class_names = _findall(CLASS_RE, content)
+            
+            # Extract React components (uppercase first letter)
+            component_names = [name for name in _findall(COMPONENT_RE, content)
+                               if name and name[0].isupper()]
         
-        # Extract arrow functions - improved pattern
-        arrow_pattern = r"(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s+)?\([^)]*\)\s*=>"
-        arrow_functions = re.findall(arrow_pattern, content)
-        for func_name in arrow_functions:
-            functions.append({
-                'id': f"{module_id}.{func_name}",
-                'type': 'function',
-                'name': func_name,
-                'module': module_id
-            })
+        return self._js_module(module_id, rel_path, 'javascript', imports, exports,
+                               function_names, class_names, component_names)
+    
+    def _parse_typescript_file(self, file_path: Path, rel_path: str, source: Source) -> Dict[str, Any]:
+        """Parse a TypeScript file's source and extract structure"""
+        module_id = rel_path.replace('/', '_').replace('.ts', '').replace('.tsx', '')
         
-        # Extract classes
-        class_pattern = r"(?:export\s+)?class\s+(\w+)"
-        classes_found = re.findall(class_pattern, content)
-        for class_name in classes_found:
-            classes.append({
-                'id': f"{module_id}.{class_name}",
-                'type': 'class',
-                'name': class_name,
-                'module': module_id
-            })
+        if JS_TREE_SITTER_AVAILABLE:
+            dialect = 'tsx' if file_path.suffix == '.tsx' else 'typescript'
+            imports, exports, function_names, class_names, component_names = \
+                self._js_definitions_tree_sitter(source, dialect)
+        else:
+            content = self._normalize_newlines(source)
+            
+            # Extract imports and exports
+            imports = _findall(IMPORT_RE, content)
+            exports = _findall(EXPORT_RE, content)
+            
+            # Extract functions - generics and typed arrow functions included
+            function_names = _findall(TS_FUNCTION_RE, content) + _findall(TS_ARROW_RE, content)
+            
+            # Extract classes
+            class_names = _findall(CLASS_RE, content)
+            
+            # Extract React components - React.FC annotated or arrow (TSX)
+            component_names = [name for name in dict.fromkeys(_findall(TS_COMPONENT_RE, content))
+                               if name and name[0].isupper()]
         
-        # Extract React components - improved pattern
-        # Pattern for: export const ComponentName = ({ ... }) => {
-        react_component_pattern = r"(?:export\s+)?(?:const|function)\s+(\w+)\s*[:=].*?=>\s*\{"
-        components_found = re.findall(react_component_pattern, content)
-        for comp_name in components_found:
-            # Only add if it looks like a component (uppercase first letter)
-            if comp_name and comp_name[0].isupper():
-                components.append({
-                    'id': f"{module_id}.{comp_name}",
-                    'type': 'component',
-                    'name': comp_name,
-                    'module': module_id
-                })
+        return self._js_module(module_id, rel_path, 'typescript', imports, exports,
+                               function_names, class_names, component_names)
+    
+    def _js_module(self, module_id: str, rel_path: str, language: str,
+                   imports: List[str], exports: List[str], function_names: List[str],
+                   class_names: List[str], component_names: List[str]) -> Optional[Dict[str, Any]]:
+        """Assemble a JavaScript/TypeScript module record from definition names"""
+        functions = [{
+            'id': f"{module_id}.{name}",
+            'type': 'function',
+            'name': name,
+            'module': module_id
+        } for name in function_names]
+        
+        classes = [{
+            'id': f"{module_id}.{name}",
+            'type': 'class',
+            'name': name,
+            'module': module_id
+        } for name in class_names]
+        
+        components = [{
+            'id': f"{module_id}.{name}",
+            'type': 'component',
+            'name': name,
+            'module': module_id
+        } for name in component_names]
         
         # Only return if we found something
         if not (functions or classes or components):
@@ -267,7 +628,7 @@ class CodeParser:
         return {
             'id': module_id,
             'path': rel_path,
-            'language': 'javascript',
+            'language': language,
             'classes': classes,
             'functions': functions,
             'components': components,
@@ -275,100 +636,83 @@ class CodeParser:
             'exports': exports
         }
     
-    def _parse_typescript_file(self, file_path: Path, repo_path: Path) -> Dict[str, Any]:
-        """Parse a TypeScript file and extract structure"""
-        rel_path = str(file_path.relative_to(repo_path))
-        module_id = rel_path.replace('/', '_').replace('.ts', '').replace('.tsx', '')
+    def _js_definitions_tree_sitter(self, source: Source, dialect: str) -> Tuple[List[str], ...]:
+        """Collect imports, exports, functions, classes and components with tree-sitter
         
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-            return None
+        Returns name lists in source order. Components are uppercase
+        variables bound to an arrow function or annotated as React.FC.
+        """
+        parser = self._js_parsers.get(dialect)
+        if parser is None:
+            parser = self._js_parsers[dialect] = Parser(JS_LANGUAGES[dialect])
         
-        functions = []
-        classes = []
-        components = []
         imports = []
         exports = []
-        
-        # Extract imports - improved pattern
-        import_pattern = r"import\s+(?:.*?\s+from\s+)?['\"]([^'\"]+)['\"]"
-        imports = re.findall(import_pattern, content)
-        
-        # Extract exports - improved pattern
-        export_pattern = r"export\s+(?:default\s+)?(?:class|function|const|let|var|interface|type)\s+(\w+)"
-        exports_found = re.findall(export_pattern, content)
-        exports.extend(exports_found)
-        
-        # Extract functions
-        func_pattern = r"(?:export\s+)?(?:async\s+)?function\s+(\w+)\s*[<\(]"
-        functions_found = re.findall(func_pattern, content)
-        for func_name in functions_found:
-            functions.append({
-                'id': f"{module_id}.{func_name}",
-                'type': 'function',
-                'name': func_name,
-                'module': module_id
-            })
-        
-        # Extract arrow functions - improved pattern for TypeScript
-        arrow_pattern = r"(?:export\s+)?(?:const|let|var)\s+(\w+)\s*[:=]\s*(?:[^=]*)?=>\s*\{"
-        arrow_functions = re.findall(arrow_pattern, content)
-        for func_name in arrow_functions:
-            functions.append({
-                'id': f"{module_id}.{func_name}",
-                'type': 'function',
-                'name': func_name,
-                'module': module_id
-            })
-        
-        # Extract classes
-        class_pattern = r"(?:export\s+)?class\s+(\w+)"
-        classes_found = re.findall(class_pattern, content)
-        for class_name in classes_found:
-            classes.append({
-                'id': f"{module_id}.{class_name}",
-                'type': 'class',
-                'name': class_name,
-                'module': module_id
-            })
-        
-        # Extract React components - improved pattern for TSX
-        # Pattern for: export const ComponentName: React.FC<Props> = ({ ... }) => {
-        react_component_pattern1 = r"(?:export\s+)?(?:const|function)\s+(\w+)\s*:\s*React\.FC"
-        # Pattern for: export const ComponentName = ({ ... }) => {
-        react_component_pattern2 = r"(?:export\s+)?(?:const|function)\s+(\w+)\s*[:=].*?=>\s*\{"
-        
-        components_found1 = re.findall(react_component_pattern1, content)
-        components_found2 = re.findall(react_component_pattern2, content)
-        
-        all_components = set(components_found1 + components_found2)
-        for comp_name in all_components:
-            # Only add if it looks like a component (uppercase first letter)
-            if comp_name and comp_name[0].isupper():
-                components.append({
-                    'id': f"{module_id}.{comp_name}",
-                    'type': 'component',
-                    'name': comp_name,
-                    'module': module_id
-                })
-        
-        # Only return if we found something
-        if not (functions or classes or components):
-            return None
-        
-        return {
-            'id': module_id,
-            'path': rel_path,
-            'language': 'typescript',
-            'classes': classes,
-            'functions': functions,
-            'components': components,
-            'imports': imports,
-            'exports': exports
-        }
+        function_names = []
+        class_names = []
+        component_names = {}  # ordered set
+        
+        def name_of(node) -> Optional[str]:
+            name = node.child_by_field_name('name')
+            return name.text.decode('utf-8', 'replace') if name is not None else None
+        
+        # Depth-first in source order
+        stack = [parser.parse(source).root_node]
+        while stack:
+            node = stack.pop()
+            node_type = node.type
+            if node_type == 'import_statement':
+                module = node.child_by_field_name('source')
+                if module is not None:
+                    imports.append(module.text.decode('utf-8', 'replace')[1:-1])
+                continue
+            if node_type == 'export_statement':
+                declaration = node.child_by_field_name('declaration')
+                if declaration is None:
+                    # export { a, b as c }
+                    for child in node.named_children:
+                        if child.type == 'export_clause':
+                            exports.extend(
+                                (spec.child_by_field_name('alias') or spec.child_by_field_name('name'))
+                                .text.decode('utf-8', 'replace')
+                                for spec in child.named_children if spec.type == 'export_specifier')
+                elif declaration.type in JS_NAMED_EXPORT_NODES:
+                    name = name_of(declaration)
+                    if name:
+                        exports.append(name)
+                else:
+                    exports.extend(name_of(declarator) for declarator in declaration.named_children
+                                   if declarator.type == 'variable_declarator'
+                                   and declarator.child_by_field_name('name').type == 'identifier')
+            elif node_type in JS_FUNCTION_NODES:
+                name = name_of(node)
+                if name:
+                    function_names.append(name)
+            elif node_type in JS_CLASS_NODES:
+                name = name_of(node)
+                if name:
+                    class_names.append(name)
+            elif node_type == 'variable_declarator':
+                name_node = node.child_by_field_name('name')
+                if name_node.type == 'identifier':
+                    name = name_node.text.decode('utf-8', 'replace')
+                    value = node.child_by_field_name('value')
+                    is_arrow = value is not None and value.type == 'arrow_function'
+                    if is_arrow:
+                        function_names.append(name)
+                    annotation = node.child_by_field_name('type')
+                    is_fc = annotation is not None and b'React.FC' in annotation.text
+                    if (is_arrow or is_fc) and name[0].isupper():
+                        component_names[name] = None
+            stack.extend(reversed(node.named_children))
+        
+        return imports, exports, function_names, class_names, list(component_names)
+    
+    def _normalize_newlines(self, source: Source) -> Source:
+        """Convert \\r\\n and lone \\r line endings to \\n, copying only if needed"""
+        if source.find(b'\r') == -1:
+            return source
+        return bytes(source).replace(b'\r\n', b'\n').replace(b'\r', b'\n')
     
     def _extract_dependencies(self, repo_path: Path) -> List[Dict[str, str]]:
         """Extract dependencies from package.json or requirements.txt"""
@@ -376,11 +720,10 @@ class CodeParser:
         
         # Check for package.json (Node.js/JavaScript)
         package_json = repo_path / 'package.json'
-        if package_json.exists():
+        if package_json.exists() and package_json.resolve().is_relative_to(repo_path.resolve()):
             try:
-                with open(package_json, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    
+                data = orjson.loads(package_json.read_bytes())
+                
                 # Extract dependencies
                 deps = data.get('dependencies', {})
                 dev_deps = data.get('devDependencies', {})
@@ -399,59 +742,279 @@ class CodeParser:
                         'type': 'devDependency'
                     })
             except Exception as e:
-                print(f"Error reading package.json: {e}")
+                logger.warning("Error reading package.json: %s", e)
         
         # Check for requirements.txt (Python)
         requirements_txt = repo_path / 'requirements.txt'
         if requirements_txt.exists():
-            try:
-                with open(requirements_txt, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            # Parse package name and version
-                            if '==' in line:
-                                name, version = line.split('==', 1)
-                                dependencies.append({
-                                    'name': name.strip(),
-                                    'version': version.strip(),
-                                    'type': 'dependency'
-                                })
-                            else:
-                                dependencies.append({
-                                    'name': line,
-                                    'version': 'latest',
-                                    'type': 'dependency'
-                                })
-            except Exception as e:
-                print(f"Error reading requirements.txt: {e}")
+            self._extract_requirements(requirements_txt, dependencies, set(), repo_path.resolve())
         
         return dependencies
     
+    def _extract_requirements(self, requirements_path: Path, dependencies: List[Dict[str, str]],
+                              seen: Set[Path], repo_root: Path):
+        """Append a requirements file's packages, following -r/--requirement includes"""
+        # Resolving follows symlinks, so a link out of the clone is caught too
+        requirements_path = requirements_path.resolve()
+        if not requirements_path.is_relative_to(repo_root):
+            logger.warning("Skipping requirements file outside the repository: %s", requirements_path)
+            return
+        if requirements_path in seen:
+            return
+        seen.add(requirements_path)
+        
+        try:
+            with open(requirements_path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning("Error reading %s: %s", requirements_path.name, e)
+            return
+        
+        for line in lines:
+            line = line.split(' #', 1)[0].strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            if line.startswith(('-r ', '--requirement ', '--requirement=')):
+                included = line.split('=', 1)[1] if line.startswith('--requirement=') else line.split(None, 1)[1]
+                self._extract_requirements(requirements_path.parent / included.strip(),
+                                           dependencies, seen, repo_root)
+                continue
+            if line.startswith('-'):
+                # pip options (-e, -c, --index-url, ...) aren't packages
+                continue
+            
+            dependencies.append({
+                **self._parse_requirement(line),
+                'type': 'dependency'
+            })
+    
+    def _parse_requirement(self, line: str) -> Dict[str, str]:
+        """Split a requirement line into name and version (an exact pin, a specifier, or 'latest')"""
+        if PACKAGING_AVAILABLE:
+            try:
+                requirement = Requirement(line)
+            except InvalidRequirement:
+                return {'name': line, 'version': 'latest'}
+            specs = list(requirement.specifier)
+            if len(specs) == 1 and specs[0].operator == '==':
+                version = specs[0].version
+            else:
+                version = str(requirement.specifier) or 'latest'
+            return {'name': requirement.name, 'version': version}
+        
+        # Parse package name and version
+        if '==' in line:
+            name, version = line.split('==', 1)
+            return {'name': name.strip(), 'version': version.strip()}
+        return {'name': line, 'version': 'latest'}
+    
     def _should_skip_file(self, file_path: Path) -> bool:
-        """Check if file should be skipped"""
-        path_str = str(file_path)
-        
-        # More specific patterns to avoid false matches
-        skip_patterns = [
-            '__pycache__',
-            '/venv/',
-            '/.venv/',
-            '/node_modules/',
-            '/.git/',
-            '/dist/',
-            '/build/',
-            'node_modules',
-        ]
-        
-        # Check for .git directory (but not .git extension in file names)
-        if '/.git/' in path_str or path_str.endswith('/.git'):
-            return True
-        
-        # Check if any pattern matches
-        for pattern in skip_patterns:
-            if pattern in path_str:
-                return True
-        
-        return False
+        """Check if file should be skipped (it lies under one of SKIP_DIRS)"""
+        return not SKIP_DIRS.isdisjoint(file_path.parts[:-1])
+
+
+def _intern_module(module_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Share one copy of the module id and of each node type across a module's nodes"""
+    if not module_data:
+        return module_data
+    
+    # Results from worker processes and the AST cache arrive with a fresh
+    # copy of the module id and node type in every node
+    module_id = module_data['id'] = sys.intern(module_data['id'])
+    for group in ('classes', 'functions', 'components'):
+        for node in module_data.get(group, ()):
+            node['module'] = module_id
+            node['type'] = sys.intern(node['type'])
+    return module_data
+
+
+def _module_nodes(module_data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """A module's graph nodes, in graph order"""
+    if not module_data:
+        return []
+    return module_data['classes'] + module_data['functions'] + module_data.get('components', [])
+
+
+class IncrementalGraph:
+    """
+    A Code Context Graph (in .graph) that can be refreshed for a few changed
+    files, e.g. from a file watcher, without re-walking or re-parsing the rest.
+    Each build owns its own instance; the CodeParser it was built with only
+    lends its parsing and in-memory cache.
+    """
+    
+    def __init__(self, parser: CodeParser, repo_path: Path, cache_dir: Optional[Path] = None):
+        self.parser = parser
+        self.repo_path = repo_path
+        self.cache_dir = cache_dir
+        self.graph: Dict[str, Any] = {
+            "nodes": [],
+            "edges": [],
+            "modules": {},
+            "language_stats": {},
+            "dependencies": []
+        }
+        # rel_path -> (file_path, language, module_data), in graph order
+        self._files: Dict[str, Tuple[Path, str, Optional[Dict[str, Any]]]] = {}
+        # rel_path -> the slice of graph['nodes'] holding that file's nodes
+        self._file_to_nodes: Dict[str, range] = {}
+    
+    def update_for_files(self, changed_paths: Iterable[Union[str, Path]]) -> Dict[str, Any]:
+        """Re-parse only the given files and swap their entries into the graph
+        
+        changed_paths (absolute or relative to the repository) may include
+        files added or deleted since the build. Returns the updated graph.
+        """
+        paths = [self.repo_path / path for path in map(Path, changed_paths)]  # absolute paths stay as-is
+        for path in paths:
+            self.parser.invalidate(path)
+        
+        jobs = []
+        for file_path, rel_path, language in self.parser._collect_source_files(
+                self.repo_path, [str(path) for path in paths]):
+            if file_path.exists():
+                jobs.append((file_path, rel_path, language))
+            else:
+                self._swap(rel_path, None)
+        results = self.parser._parse_files(jobs, self.cache_dir)
+        for (file_path, rel_path, language), module_data in zip(jobs, results):
+            self._swap(rel_path, (file_path, language, _intern_module(module_data)))
+        
+        if any(path.name == 'package.json' or path.suffix == '.txt' for path in paths):
+            self.graph['dependencies'] = self.parser._extract_dependencies(self.repo_path)
+        
+        return self.graph
+    
+    def _append(self, rel_path: str, entry: Tuple[Path, str, Optional[Dict[str, Any]]]):
+        """Add a file's nodes at the end of the graph (used while building)"""
+        nodes = self.graph['nodes']
+        start = len(nodes)
+        nodes += _module_nodes(entry[2])
+        self._files[rel_path] = entry
+        self._file_to_nodes[rel_path] = range(start, len(nodes))
+        self._account(entry[1], entry[2])
+    
+    def _swap(self, rel_path: str, entry: Optional[Tuple[Path, str, Optional[Dict[str, Any]]]]):
+        """Replace one file's modules and nodes with entry's, or drop them if entry is None"""
+        if rel_path not in self._files:
+            if entry is None:
+                return
+            self._insert(rel_path, entry[0], entry[1])
+        
+        _, old_language, old_module = self._files[rel_path]
+        self._unaccount(old_language, old_module)
+        
+        span = self._file_to_nodes[rel_path]
+        new_nodes = _module_nodes(entry[2]) if entry else []
+        self.graph['nodes'][span.start:span.stop] = new_nodes
+        
+        # Files after this one move by the change in its node count
+        delta = len(new_nodes) - len(span)
+        if delta:
+            after = False
+            for key, other in self._file_to_nodes.items():
+                if after:
+                    self._file_to_nodes[key] = range(other.start + delta, other.stop + delta)
+                elif key == rel_path:
+                    after = True
+        
+        if entry is None:
+            del self._files[rel_path]
+            del self._file_to_nodes[rel_path]
+        else:
+            self._files[rel_path] = entry
+            self._file_to_nodes[rel_path] = range(span.start, span.start + len(new_nodes))
+            self._account(entry[1], entry[2])
+    
+    def _insert(self, rel_path: str, file_path: Path, language: str):
+        """Slot a new, still empty file in at the end of its language's group"""
+        rank = SOURCE_SUFFIXES[file_path.suffix][0]
+        keys = list(self._files)
+        index, position = len(keys), len(self.graph['nodes'])
+        for i, key in enumerate(keys):
+            if SOURCE_SUFFIXES[self._files[key][0].suffix][0] > rank:
+                index, position = i, self._file_to_nodes[key].start
+                break
+        
+        # Both maps stay in graph order, which _swap relies on
+        keys.insert(index, rel_path)
+        self._files[rel_path] = (file_path, language, None)
+        self._file_to_nodes[rel_path] = range(position, position)
+        self._files = {key: self._files[key] for key in keys}
+        self._file_to_nodes = {key: self._file_to_nodes[key] for key in keys}
+    
+    def _account(self, language: str, module_data: Optional[Dict[str, Any]]):
+        if not module_data:
+            return
+        self.graph['modules'][module_data['id']] = module_data
+        language_stats = self.graph['language_stats']
+        language_stats[language] = language_stats.get(language, 0) + 1
+    
+    def _unaccount(self, language: str, module_data: Optional[Dict[str, Any]]):
+        if not module_data:
+            return
+        modules = self.graph['modules']
+        # Another file may have claimed the same module id since
+        if modules.get(module_data['id']) is module_data:
+            del modules[module_data['id']]
+        language_stats = self.graph['language_stats']
+        language_stats[language] -= 1
+        if not language_stats[language]:
+            del language_stats[language]
+
+
+# Process pool shared by every graph build, started on first use so
+# repeated analyses don't pay worker start-up (and tree-sitter setup) again
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    """
+    Start workers from a clean process rather than forking the server,
+    which holds the event loop thread, locks and sockets
+    """
+    try:
+        return multiprocessing.get_context("forkserver")
+    except ValueError:
+        return multiprocessing.get_context("spawn")
+
+
+def _parse_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=_pool_context())
+        return _pool
+
+
+def _discard_parse_pool():
+    """Drop a broken pool so the next build starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+@atexit.register
+def _shutdown_parse_pool():
+    """Stop the workers when the interpreter exits"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+# Per-process parser used by pool workers
+_worker_parser: Optional[CodeParser] = None
+
 
+def _parse_file_job(job: Tuple[Path, str, str, Optional[Path]]) -> Optional[Dict[str, Any]]:
+    """Process pool entry point: parse one (file_path, rel_path, language, cache_dir) job"""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = CodeParser()
+    return _worker_parser._parse_file(*job)